@@ -3,6 +3,7 @@ from .base import BaseFile
 from .file import File, FileObject
 from .html import Html
 from .json import Json
+from .jsonl import JsonLines
 from .markdown.markdown_file import Markdown
 from .css import Css
 from .ini import Ini
@@ -1,6 +1,9 @@
 from __future__ import absolute_import
 
-from typing import Text
+import codecs
+
+from collections import OrderedDict
+from typing import Text, Tuple
 
 from appyratus.logging import logger
 from appyratus.utils.path_utils import PathUtils
@@ -14,6 +17,25 @@ class File(BaseFile):
     """
     ENCODINGS = ('utf-8', 'utf-16', 'ascii', 'latin')
 
+    # byte order marks, longest first, as the UTF-32 LE BOM starts with the
+    # UTF-16 LE one.
+    BOMS = (
+        (codecs.BOM_UTF32_LE, 'utf-32'),
+        (codecs.BOM_UTF32_BE, 'utf-32'),
+        (codecs.BOM_UTF8, 'utf-8-sig'),
+        (codecs.BOM_UTF16_LE, 'utf-16'),
+        (codecs.BOM_UTF16_BE, 'utf-16'),
+    )
+
+    # almost any even-length bytes decode as UTF-16, so without a BOM, these
+    # are only tried if there are NUL bytes, which wide-encoded text has.
+    WIDE_ENCODINGS = {'utf-16', 'utf-32'}
+
+    # the encoding each path was last read with by each file type, for
+    # get_encoding. only the most recently read paths are kept.
+    max_encodings = 1024
+    _encodings = OrderedDict()
+
     @classmethod
     def extensions(cls):
         return {}
@@ -31,40 +53,82 @@ class File(BaseFile):
         if not cls.exists(path):
             return
 
-        data = None
-        is_read_success = False
         mode = mode if mode else 'r'
 
-        if mode == 'r':
-            for encoding in cls.ENCODINGS:
-                try:
-                    logger.debug(f'loading {path} [{mode},{encoding}]')
-                    with open(path, mode, encoding=encoding) as contents:
-                        data = contents.read()
-                    is_read_success = True
-                    break
-                except UnicodeError as exc:
-                    logger.error(exc)
-        elif mode == 'rb':
-            # when specifying binary mode (rb) the open command cannot
-            # accept an encoding argument
-            try:
-                logger.debug(f'loading {path} [{mode}]')
-                with open(path, mode) as contents:
-                    data = contents.read()
-                is_read_success = True
-            except UnicodeError as exc:
-                logger.error(exc)
+        # the file is read from disk once, whatever its encoding
+        logger.debug(f'loading {path} [{mode}]')
+        with open(path, 'rb') as contents:
+            raw = contents.read()
 
-        if not is_read_success:
+        if mode == 'rb':
+            return raw
+
+        data, encoding = cls.decode(raw, path=path)
+        if data is None:
             raise IOError(
                 'could not open {}. the file must be '
                 'encoded in any of the following formats: '
                 '{}'.format(path, ', '.join(cls.ENCODINGS))
             )
 
+        cls._remember_encoding(path, encoding)
         return data
 
+    @classmethod
+    def _remember_encoding(cls, path: Text, encoding: Text):
+        encodings = File._encodings
+        key = (cls, path)
+        encodings.pop(key, None)
+        encodings[key] = encoding
+        while len(encodings) > cls.max_encodings:
+            try:
+                encodings.popitem(last=False)
+            except KeyError:
+                break
+
+    @classmethod
+    def get_encoding(cls, path: Text) -> Text:
+        """
+        Return the encoding the file was decoded with when it was last read
+        by this file type, or None if it hasn't been read recently.
+        """
+        return File._encodings.get((cls, path))
+
+    @classmethod
+    def decode(cls, raw: bytes, path: Text = None) -> Tuple[Text, Text]:
+        """
+        Decode the contents of a file, returning the text, with newlines
+        translated as they are when reading in text mode, and the encoding
+        used, or (None, None) if no encoding works. An encoding indicated by
+        a byte order mark is tried first, followed by ENCODINGS, in order. The
+        path is only used in log messages.
+        """
+        candidates = []
+        for bom, encoding in cls.BOMS:
+            if raw.startswith(bom):
+                candidates.append(encoding)
+                break
+        candidates.extend(cls.ENCODINGS)
+
+        skipped = set()
+        if candidates[0] not in cls.WIDE_ENCODINGS and b'\x00' not in raw:
+            skipped.update(cls.WIDE_ENCODINGS)
+
+        for encoding in candidates:
+            if encoding in skipped:
+                continue
+            skipped.add(encoding)
+            try:
+                text = raw.decode(encoding)
+            except UnicodeError as exc:
+                logger.debug(f'could not decode {path or "data"} as {encoding}: {exc}')
+                continue
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            return (text, encoding)
+
+        return (None, None)
+
     @classmethod
     def write(cls, path: Text, data=None, encode=True, **kwargs):
         with open(path, 'wb') as write_bytes:
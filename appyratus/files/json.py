@@ -1,12 +1,47 @@
 from __future__ import absolute_import
 
-from typing import Text
+import codecs
+import re
 
-import jsbeautifier
+from typing import IO, Iterator, Text, Union
+
+import rapidjson
 
 from .file import File
 from appyratus.json import JsonEncoder
 
+JSON_STRING_PATTERN = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+
+# the tokens that matter when splitting an array into its items: complete
+# strings, which are skipped, brackets and commas. a lone quote is the start
+# of a string that doesn't end within the bytes read so far.
+ARRAY_TOKEN_RE = re.compile(JSON_STRING_PATTERN + rb'|"|[\[\]{},]', re.S)
+
+# the rest of a string, from within it up to its closing quote. it stops
+# short of a backslash at the end of the bytes read, whose escape is unknown.
+STRING_REST_RE = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*', re.S)
+
+WHITESPACE_RE = re.compile(rb'[ \t\n\r]*')
+
+QUOTE = ord('"')
+OPEN_BRACKET = ord('[')
+
+
+def _build_array_item_re(max_depth: int):
+    # matches a whole array item with up to max_depth levels of nesting in
+    # one call, which is much faster than scanning it token by token. it is
+    # only used to find where an item ends, so it needn't reject bad JSON.
+    content = rb'(?:[^"\[\]{}]|' + JSON_STRING_PATTERN + rb')*'
+    for _ in range(max_depth):
+        container = rb'[\[{]' + content + rb'[\]}]'
+        content = rb'(?:[^"\[\]{}]|' + JSON_STRING_PATTERN + rb'|' + container + rb')*'
+    return re.compile(
+        rb'(?:[^"\[\]{},]|' + JSON_STRING_PATTERN + rb'|' + container + rb')*', re.S
+    )
+
+
+ARRAY_ITEM_RE = _build_array_item_re(max_depth=6)
+
 
 class Json(File):
     """
@@ -24,6 +59,120 @@ class Json(File):
         data = super().read(path)
         return cls.load(data)
 
+    @classmethod
+    def iter_items(
+        cls,
+        source: Union[Text, IO],
+        chunk_size: int = 1 << 20,
+    ) -> Iterator:
+        """
+        # Iter Items
+        Lazily decode the items of a JSON document whose top level is an
+        array, given its path or a stream open for reading. The document is
+        read in chunks of chunk_size, so at most one chunk and one item are
+        held in memory at a time, however large the document is.
+        """
+        if isinstance(source, str):
+            if not cls.exists(source):
+                return
+            with open(source, 'rb') as stream:
+                yield from cls.iter_items(stream, chunk_size=chunk_size)
+            return
+
+        decode = rapidjson.loads
+        search = ARRAY_TOKEN_RE.search
+        match_item = ARRAY_ITEM_RE.match
+        match_string_rest = STRING_REST_RE.match
+        match_space = WHITESPACE_RE.match
+        read = source.read
+        buf = bytearray()
+        pos = 0            # where to resume scanning
+        start = None       # where the current item starts, once in the array
+        depth = 0
+        fresh = False      # is the current item yet to be matched whole?
+        in_string = False  # does pos lie within a string?
+        first_chunk = True
+
+        while True:
+            if in_string:
+                # resume scanning the string where the last chunk ended
+                pos = match_string_rest(buf, pos).end()
+                if pos < len(buf) and buf[pos] == QUOTE:
+                    pos += 1
+                    in_string = False
+                    continue
+            elif start is None:
+                pos = match_space(buf, pos).end()
+                if pos < len(buf):
+                    if buf[pos] != OPEN_BRACKET:
+                        raise ValueError('top level of JSON document is not an array')
+                    pos = start = pos + 1
+                    depth = 1
+                    fresh = True
+                    continue
+            elif fresh:
+                # try to match the next item whole, or else scan its tokens,
+                # starting after the part of it that did match.
+                fresh = False
+                pos = match_item(buf, start).end()
+                terminator = buf[pos:pos + 1]
+                if terminator == b',':
+                    yield decode(buf[start:pos])
+                    pos = start = pos + 1
+                    fresh = True
+                    continue
+                if terminator == b']':
+                    item = buf[start:pos]
+                    if item.strip():
+                        yield decode(item)
+                    return
+                continue
+            else:
+                match = search(buf, pos)
+                if match is not None:
+                    token = match.group()
+                    pos = match.end()
+                    if token == b'"':
+                        # a string that doesn't end within the bytes read
+                        in_string = True
+                    elif token[:1] == b'"':
+                        pass
+                    elif token in b'[{':
+                        depth += 1
+                    elif token in b']}':
+                        depth -= 1
+                        if not depth:
+                            item = buf[start:match.start()]
+                            if item.strip():
+                                yield decode(item)
+                            return
+                    elif depth == 1:
+                        yield decode(buf[start:match.start()])
+                        start = pos
+                        fresh = True
+                    continue
+                pos = len(buf)
+
+            # need more bytes to go on
+            chunk = read(chunk_size)
+            if not chunk:
+                raise ValueError('JSON array ended unexpectedly')
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if first_chunk:
+                first_chunk = False
+                if chunk.startswith(codecs.BOM_UTF8):
+                    chunk = chunk[len(codecs.BOM_UTF8):]
+            # drop what's been consumed. the buffer grows in place, so the
+            # bytes of an item aren't copied again for each chunk it spans.
+            keep = pos if start is None else start
+            if keep:
+                del buf[:keep]
+                pos -= keep
+                if start is not None:
+                    start = 0
+            buf += chunk
+
     @classmethod
     def write(cls, path: Text, data=None, **kwargs):
         file_data = cls.dump(data, **kwargs)
@@ -40,17 +189,27 @@ class Json(File):
         indent: int = 2,
         sort_keys: bool = True,
         prettify: bool = True,
+        beautify: bool = False,
         **kwargs
     ):
+        """
+        # Dump
+        Encode data as JSON. If prettify is set, rapidjson indents the output
+        as it encodes it; otherwise, the output is compact. If beautify is
+        set, the output is also passed through jsbeautifier, which is much
+        slower and only needed for its particular formatting.
+        """
         data = cls._encoder.encode(
             data,
-            indent=indent,
+            indent=indent if prettify else None,
             sort_keys=sort_keys,
         )
-        if prettify:
-            cls.prettify(data)
+        if beautify:
+            data = cls.prettify(data)
         return data
 
     @classmethod
     def prettify(cls, data):
+        import jsbeautifier
+
         return jsbeautifier.beautify(data)
@@ -0,0 +1,135 @@
+from __future__ import absolute_import
+
+import codecs
+import io
+
+from typing import Dict, Iterable, Iterator, List, Text
+
+import rapidjson
+
+from .file import File
+from appyratus.json import JsonEncoder
+
+
+class JsonLines(File):
+    """
+    # JSON Lines File Type
+    One JSON document per line, also known as NDJSON. Files are read and
+    written one record at a time, so they can be far larger than memory.
+
+    # Usage
+    ```python
+    for event in JsonLines.iter_read('events.jsonl', schema=EventSchema()):
+        ...
+    JsonLines.write_many('events.jsonl', events)
+    ```
+    """
+
+    _encoder = JsonEncoder.get_instance()
+
+    @classmethod
+    def extensions(cls):
+        return {'jsonl', 'ndjson'}
+
+    @classmethod
+    def read(cls, path: Text, schema: 'Schema' = None, strict=True) -> List:
+        if not cls.exists(path):
+            return
+        return list(cls.iter_read(path, schema=schema, strict=strict))
+
+    @classmethod
+    def iter_read(
+        cls,
+        path: Text,
+        schema: 'Schema' = None,
+        strict=True,
+    ) -> Iterator:
+        """
+        # Iter Read
+        Lazily decode each line of the file, skipping blank lines. Lines are
+        read as bytes and decoded straight from UTF-8 by rapidjson. If a schema
+        is given, each record is yielded as processed by it: the processed
+        dict, or, if strict is unset, the `(data, errors)` results. In strict
+        mode, the first invalid record raises a ValidationError.
+        """
+        if not cls.exists(path):
+            return
+
+        decode = rapidjson.loads
+        with open(path, 'rb') as lines:
+            for line_no, line in enumerate(lines, 1):
+                if line_no == 1 and line.startswith(codecs.BOM_UTF8):
+                    line = line[len(codecs.BOM_UTF8):]
+                if not line.strip():
+                    continue
+                try:
+                    record = decode(line)
+                except rapidjson.JSONDecodeError as exc:
+                    raise ValueError(f'{path}:{line_no}: {exc}') from exc
+                if schema is not None:
+                    record = schema.process(record, strict=strict)
+                yield record
+
+    @classmethod
+    def write(cls, path: Text, data=None, **kwargs):
+        cls.write_many(path, data or (), append=False)
+
+    @classmethod
+    def write_many(
+        cls,
+        path: Text,
+        records: Iterable[Dict],
+        append=True,
+        schema: 'Schema' = None,
+        buffer_size: int = 1 << 16,
+    ) -> int:
+        """
+        # Write Many
+        Encode each record on its own line, appending them to the file unless
+        append is unset. Records are encoded into a reusable buffer, which is
+        written to the file whenever it holds more than buffer_size bytes, so
+        records can be a generator over a large source. If a schema is given,
+        records are encoded by its compiled `SchemaEncoder`. Returns the number
+        of records written.
+        """
+        if schema is not None:
+            encode = type(schema).get_encoder().encode
+        else:
+            default = cls._encoder.default
+
+            def encode(record, stream):
+                rapidjson.dump(record, stream, default=default)
+
+        count = 0
+        buffer = io.BytesIO()
+        with open(path, 'ab' if append else 'wb') as output:
+
+            def flush():
+                # the buffer is rewound rather than reallocated
+                with buffer.getbuffer() as view:
+                    output.write(view[:buffer.tell()])
+                buffer.seek(0)
+
+            for record in records:
+                encode(record, stream=buffer)
+                buffer.write(b'\n')
+                count += 1
+                if buffer.tell() > buffer_size:
+                    flush()
+            if buffer.tell():
+                flush()
+
+        return count
+
+    @classmethod
+    def load(cls, data: Text) -> List:
+        if not data:
+            return None
+        return [
+            cls._encoder.decode(line) for line in data.splitlines()
+            if line.strip()
+        ]
+
+    @classmethod
+    def dump(cls, data: Iterable[Dict], **kwargs) -> Text:
+        return ''.join(f'{cls._encoder.encode(record)}\n' for record in data)
@@ -1,10 +1,12 @@
 from __future__ import absolute_import
 
+import threading
+
 from datetime import (
     date,
     datetime,
 )
-from typing import Dict
+from typing import Callable, Dict
 from uuid import UUID
 
 import rapidjson
@@ -16,9 +18,14 @@ from appyratus.utils.dict_utils import DictObject
 class JsonEncoder(object):
     """
     # Json Encoder
-    Backed by rapidjson 
+    Backed by rapidjson. Objects that rapidjson can't encode natively are
+    converted by the handler registered for the nearest class in their MRO,
+    or by `str` if there is none. Handlers are resolved once per type.
     """
 
+    _instance = None
+    _instance_lock = threading.Lock()
+
     def __init__(self, defaults: Dict = None):
         self.defaults = {
             datetime: lambda x: TimeUtils.to_timestamp(x),
@@ -28,21 +35,68 @@ class JsonEncoder(object):
             DictObject: lambda x: x.to_dict(),
         }
         self.defaults.update(defaults or {})
+        # handlers resolved for each type seen by default. replaced, rather
+        # than cleared, when handlers change so that readers need no lock.
+        self._handlers = {}
+        self._lock = threading.Lock()
 
     @classmethod
-    def get_instance(cls):
+    def get_instance(cls) -> 'JsonEncoder':
         """
         # Get Instance
-        Get an instance of the Json Encoder class
+        Get the Json Encoder instance shared by the whole process. Each
+        subclass has an instance of its own.
+        """
+        instance = cls.__dict__.get('_instance')
+        if instance is None:
+            with cls._instance_lock:
+                instance = cls.__dict__.get('_instance')
+                if instance is None:
+                    instance = cls()
+                    cls._instance = instance
+        return instance
+
+    def register(self, target_type: type, handler: Callable):
+        """
+        # Register
+        Encode objects of the given type, and of its subclasses, with the
+        result of calling the handler on them.
+        """
+        with self._lock:
+            self.defaults[target_type] = handler
+            self._handlers = {}
+
+    def unregister(self, target_type: type):
+        """
+        # Unregister
+        Remove the handler for the given type, if any.
+        """
+        with self._lock:
+            self.defaults.pop(target_type, None)
+            self._handlers = {}
+
+    def get_handler(self, target_type: type) -> Callable:
+        """
+        # Get Handler
+        Return the handler used to encode objects of the given type.
         """
-        # TODO make this a singleton
-        return cls()
+        handlers = self._handlers
+        handler = handlers.get(target_type)
+        if handler is None:
+            handler = str
+            for base in target_type.__mro__:
+                base_handler = self.defaults.get(base)
+                if base_handler is not None:
+                    handler = base_handler
+                    break
+            handlers[target_type] = handler
+        return handler
 
     def default(self, target, **kwargs):
-        func = self.defaults.get(target.__class__)
-        if func is None:
-            return str(target)
-        return func(target)
+        handler = self._handlers.get(target.__class__)
+        if handler is None:
+            handler = self.get_handler(target.__class__)
+        return handler(target)
 
     def encode(self, target, **kwargs):
         """
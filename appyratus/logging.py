@@ -9,7 +9,7 @@ from typing import Text, Dict
 from appyratus.json import JsonEncoder
 from appyratus.utils.time_utils import TimeUtils
 
-json = JsonEncoder()
+json = JsonEncoder.get_instance()
 
 
 class LoggerInterface(object):
@@ -1,4 +1,8 @@
 from .fields import Field
 from .schema import Schema
 from .exc import ValidationError
+from .cache import ResultCache
+from .executor import SchemaExecutor
+from .record import SchemaRecord
+from .metrics import SchemaMetrics
 from . import fields
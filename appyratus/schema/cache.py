@@ -0,0 +1,178 @@
+import threading
+import time
+
+from collections import OrderedDict
+from copy import deepcopy
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Hashable, Tuple
+from uuid import UUID
+
+import rapidjson
+
+# the exact types of values in records that can be cached. subclasses, like
+# IntEnum members, and look-alikes, like tuples, encode just like these but
+# may not be processed alike, so they aren't cached.
+JSON_SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+IMMUTABLE_TYPES = frozenset({
+    str, bytes, int, float, bool, type(None), UUID, Decimal, datetime, date,
+    timedelta,
+})
+
+
+def is_json_value(value) -> bool:
+    """
+    Return True if the value is made only of exact dicts with str keys,
+    lists and JSON scalars.
+    """
+    value_type = type(value)
+    if value_type in JSON_SCALAR_TYPES:
+        return True
+    # scalars are checked inline, as recursing for each one is slow
+    if value_type is dict:
+        for k, v in value.items():
+            if type(k) is not str or (
+                type(v) not in JSON_SCALAR_TYPES and not is_json_value(v)
+            ):
+                return False
+        return True
+    if value_type is list:
+        for v in value:
+            if type(v) not in JSON_SCALAR_TYPES and not is_json_value(v):
+                return False
+        return True
+    return False
+
+
+def copy_result(value):
+    """
+    Deep-copy processed data, which is mostly made of dicts, lists and
+    immutable scalars, much faster than deepcopy does.
+    """
+    value_type = type(value)
+    if value_type in IMMUTABLE_TYPES:
+        return value
+    if value_type is dict:
+        return {
+            k: v if type(v) in IMMUTABLE_TYPES else copy_result(v)
+            for k, v in value.items()
+        }
+    if value_type is list:
+        return [v if type(v) in IMMUTABLE_TYPES else copy_result(v) for v in value]
+    if value_type is set:
+        return set(value)
+    return deepcopy(value)
+
+
+class ResultCache(object):
+    """
+    # Result Cache
+    A bounded LRU cache of `Schema.process` results, keyed by the canonical
+    JSON encoding of the source record. Only records made of JSON types are cached, as they are the
+    only ones with a stable encoding. Results are deep-copied on the way in and
+    out, so callers are free to modify them, unless `copy` is unset. A cache
+    may be shared by schemas of different classes.
+
+    # Usage
+    ```python
+    schema = EventSchema(cache=ResultCache(max_size=10000, ttl=60))
+    schema.process(event)
+    schema.cache.stats
+    ```
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = None, copy=True):
+        """
+        # Kwargs
+        - `max_size`: max number of results to keep.
+        - `ttl`: seconds after which a cached result expires, if set.
+        - `copy`: deep-copy results. unset this only if results are read-only.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.copy = copy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (
+            f'{type(self).__name__}(size={len(self)}, hits={self.hits}, '
+            f'misses={self.misses})'
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        # entries and stats stay behind, e.g. when sent to worker processes
+        return {'max_size': self.max_size, 'ttl': self.ttl, 'copy': self.copy}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @property
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0,
+        }
+
+    @staticmethod
+    def make_key(source: Dict, *args) -> Hashable:
+        """
+        Return a key for the source record and any other args that affect the
+        result, like the processor of the schema, or None if the record can't
+        be cached.
+        """
+        if not is_json_value(source):
+            return None
+        try:
+            raw = rapidjson.dumps(source, sort_keys=True)
+        except (TypeError, ValueError, OverflowError):
+            return None
+        return (raw, ) + args
+
+    def get(self, key: Hashable) -> Tuple:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at is not None and expires_at <= time.monotonic():
+                    del self._entries[key]
+                    entry = None
+                else:
+                    self._entries.move_to_end(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return self._copy(result) if self.copy else result
+
+    def set(self, key: Hashable, result: Tuple):
+        if self.copy:
+            result = self._copy(result)
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires_at, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    @staticmethod
+    def _copy(result: Tuple) -> Tuple:
+        dest, errors = result
+        return (copy_result(dest), copy_result(errors) if errors else {})
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,340 @@
+"""
+# Columns
+Columnar processing of Schema data into NumPy arrays, typed by `Field.np_dtype`.
+NumPy is an optional dependency, only required when this module is used.
+"""
+
+from collections import namedtuple
+from typing import Dict, Sequence, Tuple, Union
+
+import numpy as np
+
+from .fields.fields import (
+    INVALID_VALUE,
+    Bool,
+    Field,
+    Float,
+    Int,
+    Timestamp,
+)
+from .processor import SchemaProcessor
+
+ColumnResults = namedtuple('ColumnResults', field_names=['data', 'errors', 'mask'])
+
+# placeholder for values whose key is absent from the source data
+MISSING = object()
+
+BOOL_STRINGS = {'t': True, 'true': True, '1': True, 'f': False, 'false': False, '0': False}
+
+
+def vectorize_int(field: Int, arr: np.ndarray, dtype: np.dtype):
+    kind = arr.dtype.kind
+    if kind in 'biu':
+        ok = (arr >= 0) if field.signed else np.ones(len(arr), dtype=bool)
+        if kind != 'b' and len(arr):
+            info = np.iinfo(dtype)
+            ok &= (arr >= info.min) & (arr <= info.max)
+        values = np.zeros(len(arr), dtype=dtype)
+        values[ok] = arr[ok]
+    elif kind == 'U':
+        ok = np.char.isdigit(arr)
+        values = np.zeros(len(arr), dtype=dtype)
+        values[ok] = arr[ok].astype(dtype)
+    else:
+        return None
+    return (values, dict.fromkeys(np.flatnonzero(~ok).tolist(), INVALID_VALUE))
+
+
+def vectorize_float(field: Float, arr: np.ndarray, dtype: np.dtype):
+    if arr.dtype.kind not in 'biuf':
+        return None
+    return (arr.astype(dtype), {})
+
+
+def vectorize_bool(field: Bool, arr: np.ndarray, dtype: np.dtype):
+    kind = arr.dtype.kind
+    if kind == 'b':
+        return (arr.astype(dtype), {})
+    elif kind in 'iu':
+        ok = (arr == 0) | (arr == 1)
+        values = (arr == 1)
+    elif kind == 'U':
+        lowered = np.char.lower(arr)
+        ok = np.isin(lowered, list(BOOL_STRINGS))
+        values = np.isin(lowered, [k for k, v in BOOL_STRINGS.items() if v])
+    else:
+        return None
+    bad = dict.fromkeys(np.flatnonzero(~ok).tolist(), INVALID_VALUE)
+    return (values.astype(dtype), bad)
+
+
+def vectorize_timestamp(field: Timestamp, arr: np.ndarray, dtype: np.dtype):
+    if arr.dtype.kind not in 'biuf':
+        return None
+    return (arr.astype(dtype), {})
+
+
+# vectorized equivalents of Field.process, keyed by the process function they
+# replace, so that subclasses that override process are never vectorized.
+VECTORIZERS = {
+    Int.process: vectorize_int,
+    Float.process: vectorize_float,
+    Bool.process: vectorize_bool,
+    Timestamp.process: vectorize_timestamp,
+}
+
+
+class ColumnProcessor(object):
+    """
+    # Column Processor
+    Process a batch of records or a dict of columns into one NumPy array per
+    field. Values that are present and not null are coerced by a vectorized
+    equivalent of the field's `process` method where one exists, falling back
+    to calling `process` for each value. Missing and null values are handled
+    per value, exactly as `Schema.process` would handle them.
+    """
+
+    def __init__(self, schema_type: type):
+        self.schema_type = schema_type
+        self.processor = schema_type.get_processor()
+        self.steps = tuple(
+            self.compile_field(schema_type, field)
+            for field in self.processor.fields.values()
+        )
+
+    @staticmethod
+    def compile_field(schema_type: type, field: Field) -> Tuple:
+        dtype = np.dtype(field.np_dtype if field.scalar else object)
+        return (
+            field,
+            field.name,
+            field.source or field.name,
+            bool(field.nullable),
+            f'{field.name} not nullable',
+            dtype,
+            VECTORIZERS.get(type(field).process),
+            SchemaProcessor(schema_type, fields={field.name: field}),
+        )
+
+    def process(
+        self,
+        data: Union[Dict[str, Sequence], Sequence[Dict]],
+        ignore_required=False,
+        ignore_nullable=False,
+    ) -> ColumnResults:
+        """
+        Process either a dict of columns, keyed by source key, or a sequence of
+        record dicts. Returns the arrays, keyed by field name, a dict mapping
+        each invalid row index to its errors, and a boolean mask array for each
+        field that is set wherever the array holds no value.
+        """
+        if isinstance(data, dict):
+            columns = {key: data.get(key) for key in self.processor.keys}
+            sizes = {len(c) for c in columns.values() if c is not None}
+            if len(sizes) > 1:
+                raise ValueError('columns must all have the same length')
+            n = sizes.pop() if sizes else 0
+            columns = {
+                k: ([MISSING] * n if c is None else c)
+                for k, c in columns.items()
+            }
+        else:
+            n = len(data)
+            columns = {
+                key: [r.get(key, MISSING) for r in data]
+                for key in self.processor.keys
+            }
+
+        if self.processor.needs_context:
+            return self.process_rows(columns, n, ignore_required, ignore_nullable)
+
+        errors = {}
+        arrays = {}
+        masks = {}
+
+        for step in self.steps:
+            name = step[1]
+            arrays[name], masks[name] = self.process_column(
+                step, columns[step[2]], n, errors,
+                ignore_required, ignore_nullable
+            )
+
+        return ColumnResults(arrays, dict(sorted(errors.items())), masks)
+
+    def process_column(
+        self,
+        step: Tuple,
+        column: Sequence,
+        n: int,
+        errors: Dict,
+        ignore_required: bool,
+        ignore_nullable: bool,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        field, name, key, nullable, nullable_msg, dtype, vectorize, processor = step
+
+        # split the column into values that go straight to field.process and
+        # those that are missing or null, which need the full treatment.
+        if isinstance(column, np.ndarray) and column.dtype.kind != 'O':
+            direct_idx = None
+            direct = column
+            others = ()
+        else:
+            direct_idx, direct, others = [], [], []
+            for idx, value in enumerate(column):
+                if value is MISSING or value is None:
+                    others.append(idx)
+                else:
+                    direct_idx.append(idx)
+                    direct.append(value)
+
+        mask = np.ones(n, dtype=bool)
+        is_numeric = dtype.kind in 'biuf'
+        values = np.zeros(n, dtype=dtype) if is_numeric else [None] * n
+        bad = None
+
+        if vectorize is not None and is_numeric and len(direct):
+            try:
+                arr = np.asarray(direct)
+                if arr.ndim != 1 or (
+                    # numpy casts mixed types to str, which process wouldn't
+                    arr.dtype.kind == 'U' and direct_idx is not None and
+                    not all(isinstance(v, str) for v in direct)
+                ):
+                    vectorized = None
+                else:
+                    vectorized = vectorize(field, arr, dtype)
+            except (OverflowError, TypeError, ValueError):
+                vectorized = None
+            if vectorized is not None:
+                direct_values, bad = vectorized
+                if direct_idx is None:
+                    values[:] = direct_values
+                    mask[:] = False
+                else:
+                    values[direct_idx] = direct_values
+                    mask[direct_idx] = False
+
+        if bad is None:
+            bad = {}
+            process = field.process
+            for local_idx, value in enumerate(direct):
+                idx = local_idx if direct_idx is None else direct_idx[local_idx]
+                dest_val, err = process(value)
+                if err:
+                    bad[local_idx] = err
+                elif dest_val is not None:
+                    if self.set_value(values, idx, dest_val):
+                        mask[idx] = False
+                    else:
+                        bad[local_idx] = INVALID_VALUE
+
+        for local_idx, err in bad.items():
+            idx = local_idx if direct_idx is None else direct_idx[local_idx]
+            mask[idx] = True
+            if not (nullable or ignore_nullable):
+                err = nullable_msg
+            errors.setdefault(idx, {})[name] = err
+
+        for idx in others:
+            value = column[idx]
+            dest, errs = processor.process(
+                {} if value is MISSING else {key: value},
+                {},
+                ignore_required=ignore_required,
+                ignore_nullable=ignore_nullable,
+            )
+            dest_val = dest.get(name)
+            if dest_val is not None:
+                if self.set_value(values, idx, dest_val):
+                    mask[idx] = False
+                else:
+                    errs[name] = INVALID_VALUE
+            if errs:
+                errors.setdefault(idx, {}).update(errs)
+
+        if not is_numeric:
+            values = self.to_array(values, dtype)
+
+        return (values, mask)
+
+    def process_rows(
+        self,
+        columns: Dict,
+        n: int,
+        ignore_required: bool,
+        ignore_nullable: bool,
+    ) -> ColumnResults:
+        """
+        Process row by row. This is used for schemas with hooks, which may
+        depend on other values in the record.
+        """
+        records = [
+            {k: c[i] for k, c in columns.items() if c[i] is not MISSING}
+            for i in range(n)
+        ]
+        schema = self.schema_type()
+        results = schema.process_many(
+            records,
+            ignore_required=ignore_required,
+            ignore_nullable=ignore_nullable,
+        )
+
+        errors = {}
+        arrays = {}
+        masks = {}
+
+        for idx, (data, errs) in enumerate(results):
+            if errs:
+                errors[idx] = errs
+
+        for field, name, key, nullable, nullable_msg, dtype, *_ in self.steps:
+            mask = np.ones(n, dtype=bool)
+            is_numeric = dtype.kind in 'biuf'
+            values = np.zeros(n, dtype=dtype) if is_numeric else [None] * n
+            for idx, (data, errs) in enumerate(results):
+                dest_val = data.get(name)
+                if dest_val is not None:
+                    if self.set_value(values, idx, dest_val):
+                        mask[idx] = False
+                    else:
+                        errors.setdefault(idx, {})[name] = INVALID_VALUE
+            arrays[name] = values if is_numeric else self.to_array(values, dtype)
+            masks[name] = mask
+
+        return ColumnResults(arrays, errors, masks)
+
+    def to_structured_array(self, data, **kwargs) -> ColumnResults:
+        """
+        Like `process` but return a single structured array, with one named
+        column per field, in place of the dict of arrays.
+        """
+        arrays, errors, masks = self.process(data, **kwargs)
+        n = len(next(iter(arrays.values()))) if arrays else 0
+        array = np.zeros(
+            n, dtype=[(name, arr.dtype) for name, arr in arrays.items()]
+        )
+        for name, arr in arrays.items():
+            array[name] = arr
+        return ColumnResults(array, errors, masks)
+
+    @staticmethod
+    def set_value(values, idx: int, value) -> bool:
+        try:
+            values[idx] = value
+        except (OverflowError, TypeError, ValueError):
+            return False
+        return True
+
+    @staticmethod
+    def to_array(values: list, dtype: np.dtype) -> np.ndarray:
+        """
+        Build an array from a list of values. The length of string and bytes
+        dtypes is taken from the longest value rather than from `np_dtype`.
+        """
+        if dtype.kind == 'U':
+            return np.array(['' if v is None else v for v in values], dtype=str)
+        if dtype.kind == 'S':
+            return np.array([b'' if v is None else v for v in values], dtype=bytes)
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        return array
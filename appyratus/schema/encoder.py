@@ -0,0 +1,107 @@
+import io
+
+from typing import Dict, Iterable, Text, Union
+
+import rapidjson
+
+from appyratus.json import JsonEncoder
+
+
+class RapidJsonEncoder(rapidjson.Encoder):
+    """
+    Datetimes, dates and UUIDs are encoded natively by rapidjson, as the same
+    UTC timestamps and hex strings that `JsonEncoder` produces. Everything
+    else that rapidjson doesn't know falls back to `JsonEncoder.default`.
+    """
+
+    def __new__(cls):
+        return super().__new__(
+            cls,
+            datetime_mode=rapidjson.DM_UNIX_TIME | rapidjson.DM_NAIVE_IS_UTC,
+            uuid_mode=rapidjson.UM_HEX,
+        )
+
+    def __init__(self):
+        self.fallback = JsonEncoder.get_instance()
+
+    def default(self, obj):
+        return self.fallback.default(obj)
+
+
+class SchemaEncoder(object):
+    """
+    # Schema Encoder
+    Encodes data processed by a Schema to JSON. Each field compiles a dumper,
+    which converts its values to types that rapidjson encodes natively, or
+    None if its values need no conversion. Records are only copied when at
+    least one field has a dumper, and no per-object dispatch is done on the
+    way to rapidjson.
+    """
+
+    def __init__(self, schema_type: type):
+        self.schema_type = schema_type
+        self.json = RapidJsonEncoder()
+        # None until compiled, so that recursive schemas see themselves as
+        # needing a dumper while they are still being compiled
+        self.dumpers = None
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.schema_type.__name__})'
+
+    def compile(self):
+        dumpers = []
+        for name, field in self.schema_type.fields.items():
+            dumper = field.compile_dumper()
+            if dumper is not None:
+                dumpers.append((name, dumper))
+        self.dumpers = tuple(dumpers)
+        return self
+
+    @property
+    def needs_dump(self) -> bool:
+        return self.dumpers is None or bool(self.dumpers)
+
+    def dump(self, record: Dict) -> Dict:
+        """
+        Return the record with all of its values converted to types that can
+        be natively encoded, leaving the given record unchanged.
+        """
+        if not self.dumpers:
+            return record
+        record = record.copy()
+        for name, dumper in self.dumpers:
+            value = record.get(name)
+            if value is not None:
+                record[name] = dumper(value)
+        return record
+
+    def encode(self, record: Dict, stream=None) -> Union[Text, None]:
+        """
+        Encode a single record, returning a JSON string or writing it to the
+        stream, which can be opened in either binary or text mode.
+        """
+        return self.json(self.dump(record), stream=stream)
+
+    def encode_many(self, records: Iterable[Dict], stream=None) -> Union[Text, None]:
+        """
+        Encode the records as a JSON array. When writing to a stream, records
+        are written one at a time, so records can be a generator over a large
+        source.
+        """
+        dump = self.dump if self.dumpers else None
+        if stream is None:
+            if dump is not None:
+                records = [dump(record) for record in records]
+            elif not isinstance(records, (list, tuple)):
+                records = list(records)
+            return self.json(records)
+
+        is_text = isinstance(stream, io.TextIOBase)
+        write = stream.write
+        encode = self.json
+        write('[' if is_text else b'[')
+        for idx, record in enumerate(records):
+            if idx:
+                write(',' if is_text else b',')
+            encode(record if dump is None else dump(record), stream=stream)
+        write(']' if is_text else b']')
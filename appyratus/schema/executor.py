@@ -0,0 +1,173 @@
+import os
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Set, Text
+
+from .exc import ValidationError
+
+# the schema being used by the current worker process, set by the pool
+# initializer so that it is only sent to each worker once.
+_worker_schema = None
+
+
+def _init_worker(schema: 'Schema'):
+    global _worker_schema
+    _worker_schema = schema
+
+
+def _process_chunk(records: List[Dict], kwargs: Dict) -> List:
+    return [
+        tuple(results) for results in
+        _worker_schema.iter_process(records, **kwargs)
+    ]
+
+
+def _generate_chunk(
+    start: int, stop: int, fields: Set[Text], seed, now: datetime
+) -> List:
+    return _worker_schema.generate_range(
+        start, stop, fields=fields, seed=seed, now=now
+    )
+
+
+class SchemaExecutor(object):
+    """
+    # Schema Executor
+    Process a large sequence of records across a pool of worker processes. The
+    records are split into chunks, which are processed in parallel, and the
+    results are yielded back in their original order. Workers receive the
+    schema once, when the pool starts, rather than with every chunk.
+
+    # Usage
+    ```python
+    with SchemaExecutor(UserSchema(), workers=8) as executor:
+        results = executor.process_many(records)
+    ```
+    """
+
+    def __init__(
+        self,
+        schema: 'Schema',
+        workers: int = None,
+        chunk_size: int = 1000,
+        mp_context=None,
+    ):
+        self.schema = schema
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.mp_context = mp_context
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=self.mp_context,
+                initializer=_init_worker,
+                initargs=(self.schema, ),
+            )
+        return self._pool
+
+    def shutdown(self, wait=True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+    def process_many(self, records: Iterable[Dict], **kwargs) -> List:
+        """
+        Process all records, returning a list of results in the same order.
+        See `iter_process` for kwargs.
+        """
+        return list(self.iter_process(records, **kwargs))
+
+    def iter_process(
+        self,
+        records: Iterable[Dict],
+        strict=False,
+        ignore_required=False,
+        ignore_nullable=False,
+        only: Iterable[Text] = None,
+        fail_fast=False,
+        max_errors: int = None,
+    ) -> Iterator:
+        """
+        Lazily process all records, yielding what `Schema.process` would
+        return for each one, in order. Only a bounded number of chunks is in
+        flight at a time, so records can be a generator over a large source.
+        """
+        kwargs = {
+            'ignore_required': ignore_required,
+            'ignore_nullable': ignore_nullable,
+            'max_errors': 1 if fail_fast else max_errors,
+            # workers compile their own projection from the field names
+            'only': None if only is None else frozenset(getattr(only, 'fields', only)),
+        }
+        max_pending = 2 * self.workers
+        pending = deque()
+
+        for chunk in self.iter_chunks(records):
+            pending.append(self.pool.submit(_process_chunk, chunk, kwargs))
+            if len(pending) >= max_pending:
+                yield from self._finish(pending.popleft(), strict)
+
+        while pending:
+            yield from self._finish(pending.popleft(), strict)
+
+    def generate_many(
+        self,
+        n: int,
+        fields: Set[Text] = None,
+        seed=None,
+        now: datetime = None,
+    ) -> List:
+        """
+        Generate n records in chunks, using `Schema.generate_range` in each
+        worker. With a seed, the output is the same as `generate_many` would
+        generate in a single process.
+        """
+        max_pending = 2 * self.workers
+        pending = deque()
+        records = []
+
+        for start in range(0, n, self.chunk_size):
+            stop = min(n, start + self.chunk_size)
+            pending.append(
+                self.pool.submit(_generate_chunk, start, stop, fields, seed, now)
+            )
+            if len(pending) >= max_pending:
+                records.extend(pending.popleft().result())
+
+        while pending:
+            records.extend(pending.popleft().result())
+
+        return records
+
+    def iter_chunks(self, records: Iterable[Dict]) -> Iterator[List[Dict]]:
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _finish(self, future, strict: bool) -> Iterator:
+        # ValidationErrors aren't raised in the workers, as they hold a
+        # reference to the schema and can't be unpickled.
+        tuple_factory = self.schema.tuple_factory
+        for dest, errors in future.result():
+            if strict:
+                if errors:
+                    raise ValidationError(self.schema, errors)
+                yield dest
+            else:
+                yield tuple_factory(dest, errors)
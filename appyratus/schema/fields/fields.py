@@ -1,52 +1,161 @@
+import array
+import asyncio
 import operator
-import random
 import re
+import threading
 import time
 import typing
-import uuid
 
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal, getcontext as get_decimal_context
 from copy import deepcopy
 from datetime import date, datetime, timedelta
-from functools import reduce
+from functools import lru_cache, reduce
+from itertools import islice
 from os.path import abspath, expanduser
 from typing import Callable, Dict, Text, Type
 from uuid import UUID
+from weakref import WeakKeyDictionary, WeakSet, ref
 
 import bcrypt
-import dateutil.parser
 import pytz
 
-from faker import Faker
-
 from appyratus.utils.time_utils import TimeUtils
 from appyratus.utils.string_utils import StringUtils
 from appyratus.utils.dict_utils import DictUtils
 from appyratus.enum import Enum as EnumObject
 
 from .field_adapter import FieldAdapter
-from .value_generator import ValueGenerator, Bounds
+from .value_generator import (
+    Bounds,
+    GenerationSession,
+    ValueGenerator,
+    session_attribute,
+)
 
 RE_BCRYPT_HASH = re.compile(r'^\$2[ayb]\$.{56}$')
 RE_FLOAT = re.compile(r'^-?\d*(\.\d*)?$')
 RE_EMAIL = re.compile(r'^[a-z][\w\-\.]*@[\w\.\-]*\w\.\w+$', re.I)
 RE_UUID = re.compile(r'^[a-f0-9]{32}$')
 
+# JSON Schema equivalents of the above, in the subset of regex syntax that is
+# supported by rapidjson's Validator, which has no \d, \w or flags.
+JSON_RE_INT = '^[0-9]+$'
+JSON_RE_FLOAT = '^-?[0-9]*([.][0-9]*)?$'
+# \w can't be spelled out here, so for e-mail addresses, it stands for ASCII
+# word characters and any non-ASCII ones but controls, spaces and format
+# characters. it still allows non-ASCII symbols and punctuation, which \w
+# does not.
+JSON_WORD = (
+    'a-zA-Z0-9_\u00a1-\u00ac\u00ae-\u167f\u1681-\u180d\u180f-\u1fff'
+    '\u2010-\u2027\u2030-\u205e\u2070-\u2fff\u3001-\ud7ff\ue000-\ufefe'
+    '\uff00-\U0010ffff'
+)
+JSON_RE_EMAIL = (
+    f'^[a-zA-Z][{JSON_WORD}.-]*@[{JSON_WORD}.-]*[{JSON_WORD}][.][{JSON_WORD}]+$'
+)
+JSON_RE_UUID = '^(-*[0-9a-fA-F]){32}-*$'
+JSON_RE_BOOL = '^([tT]([rR][uU][eE])?|[fF]([aA][lL][sS][eE])?|[01])$'
+
 UNRECOGNIZED_VALUE = 'unrecognized'
 INVALID_VALUE = 'invalid'
 
+# array.array typecodes for the np_dtypes that have one
+ARRAY_TYPECODES = {
+    'int64': 'q',
+    'uint64': 'Q',
+    'int32': 'i',
+    'uint32': 'I',
+    'float64': 'd',
+    'float32': 'f',
+    'bool': 'B',
+}
+
+# inflecting names is slow, relative to creating a Schema class
+singular = lru_cache(maxsize=4096)(StringUtils.singular)
+
+# public attribute names of each field type, used by Field.spec
+SPEC_SLOTS = {}
+SPEC_SCALAR_TYPES = frozenset({str, bytes, int, float, bool, type(None), type})
+
+
+def defined_by(cls: type, name: Text) -> type:
+    """
+    Return the class in the MRO of cls that defines the named attribute.
+    """
+    return next(base for base in cls.__mro__ if name in base.__dict__)
+
+
+def spec_value(field, value):
+    """
+    Convert an attribute value of the field to a hashable form, for use in
+    `Field.spec`.
+    """
+    if type(value) in SPEC_SCALAR_TYPES:
+        return value
+    if isinstance(value, Field):
+        return value.spec()
+    if getattr(value, '__self__', None) is field:
+        # bound to the field itself, like List.create_nested
+        return ('method', value.__func__)
+    if isinstance(value, dict):
+        return ('dict', ) + tuple(
+            sorted(((k, spec_value(field, v)) for k, v in value.items()), key=repr)
+        )
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, ) + tuple(spec_value(field, v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(spec_value(field, v) for v in value)
+    hash(value)
+    return value
+
+
+# weak refs to the Schema classes that use each field, see Field.__setattr__
+FIELD_OWNERS = WeakKeyDictionary()
+
+# fields of interned Schema classes, which cannot be modified
+FROZEN_FIELDS = WeakSet()
+
+# callable defaults that always return the same value
+PURE_DEFAULTS = {list, dict, set, tuple, frozenset, str, bytes, int, float, bool}
+
 
 class Field(object):
 
+    # attributes common to all fields are kept in slots. everything else,
+    # including hooks passed to the ctor, goes in a __dict__, which is only
+    # allocated if used.
+    __slots__ = (
+        'name',
+        'source',
+        'required',
+        'nullable',
+        'default',
+        'scalar',
+        'on_create',
+        'schema',
+        '_meta',
+        '_has_constant_default',
+        '_watched',
+        '__dict__',
+        '__weakref__',
+    )
+
     # convenient references to friend classes
     Adapter = FieldAdapter
     Generator = ValueGenerator
     Bounds = Bounds
 
-    faker = Faker()
+    # the RNG and Faker instance of the current GenerationSession
+    faker = session_attribute('faker')
+    random = session_attribute('random')
+
     generator = ValueGenerator()
     np_dtype = 'O'
 
+    # unset if process isn't a pure function of the value
+    cacheable = True
+
     def __init__(
         self,
         source: Text = None,
@@ -56,7 +165,7 @@ class Field(object):
         default: object = None,
         meta: typing.Dict = None,
         scalar: bool = True,
-        np_dtype = 'object',
+        np_dtype: Text = None,
         on_create: object = None,
         before: object = None,
         after: object = None,
@@ -68,7 +177,7 @@ class Field(object):
         - `source`: key in source data if different from declared field name.
         - `name`: name of the field as declared on the host Schema class.
         - `required`: key must exist in source data if set.
-        - `np_dtype`: numpy dtype name
+        - `np_dtype`: numpy dtype name, if different from the class default.
         - `nullable`: if key exists, it can be None/null if this is set.
         - `default`: a constant or callable the returns a default value.
         - `on_create`: generic method to run upon init of host schema class.
@@ -82,20 +191,102 @@ class Field(object):
         self.default = default
         self.scalar = scalar
         self.on_create = on_create
-        self.before = before or self.before
-        self.after = after or self.after
-        self.on_generate = on_generate or self.on_generate
-        self.meta = meta or {}
-        self.meta.update(kwargs)
         self.schema = None
-        self._has_constant_default = (
-            default is not None and not callable(default)
-        )
+
+        # hooks default to the methods of the class
+        if before:
+            self.before = before
+        if after:
+            self.after = after
+        if on_generate:
+            self.on_generate = on_generate
+
+        # meta is created on first access
+        self._meta = meta or None
+        if kwargs:
+            self.meta.update(kwargs)
 
         if np_dtype:
             self.np_dtype = np_dtype
         # otherwise, default to np_dtype class attr
 
+    @property
+    def meta(self) -> typing.Dict:
+        meta = self._meta
+        if meta is None:
+            meta = self._meta = {}
+        return meta
+
+    @meta.setter
+    def meta(self, meta: typing.Dict):
+        self._meta = meta
+
+    def __setattr__(self, name, value):
+        # fields are shared by a Schema class and its subclasses, so changing
+        # a public attribute makes all of their compiled processors stale.
+        # private attributes hold caches and derived state.
+        if name[0] == '_':
+            object.__setattr__(self, name, value)
+            return
+        owners = None
+        if getattr(self, '_watched', False):
+            # copies of a watched field are neither attached nor frozen
+            if self in FROZEN_FIELDS and getattr(self, name, None) != value:
+                raise AttributeError(
+                    f'cannot set {name} of {self!r}, which belongs to an '
+                    f'interned Schema class'
+                )
+            owners = FIELD_OWNERS.get(self)
+        changed = owners and getattr(self, name, None) is not value
+        object.__setattr__(self, name, value)
+        if name == 'default':
+            object.__setattr__(
+                self, '_has_constant_default', value is not None and not callable(value)
+            )
+        if changed:
+            for owner_ref in owners:
+                owner = owner_ref()
+                if owner is not None:
+                    owner.invalidate_processor()
+
+    def attach(self, schema_type: type):
+        """
+        Register a Schema class as using this field, so that its processor is
+        invalidated whenever the field is modified.
+        """
+        owners = FIELD_OWNERS.get(self)
+        if owners is None:
+            owners = FIELD_OWNERS[self] = []
+        else:
+            # drop classes that have since been garbage collected
+            owners[:] = [owner_ref for owner_ref in owners if owner_ref() is not None]
+        owners.append(ref(schema_type))
+        self._watched = True
+
+    def freeze(self):
+        """
+        Prevent the field, and any field nested in it, from being modified,
+        as it belongs to an interned Schema class. Copies are not frozen.
+        """
+        FROZEN_FIELDS.add(self)
+        self._watched = True
+        nested = getattr(self, 'nested', None)
+        if isinstance(nested, Field) and not getattr(nested, '_is_schema_class', False):
+            # nested schemas are frozen if they are interned themselves
+            nested.freeze()
+
+    def detach(self, schema_type: type):
+        """
+        Stop invalidating the processor of the Schema class when this field is
+        modified.
+        """
+        owners = FIELD_OWNERS.get(self)
+        if owners:
+            owners[:] = [
+                owner_ref for owner_ref in owners
+                if owner_ref() not in (schema_type, None)
+            ]
+
     def __repr__(self):
         info_str = ''
         if self.source or not self.name:
@@ -121,13 +312,107 @@ class Field(object):
     def process(self, value):
         return (value, None)
 
-    def generate(self, *args, **kwargs):
-        return self.generator.generate(self, *args, **kwargs)
+    async def aprocess(self, value, **kwargs):
+        """
+        Awaitable version of `process`, used by `Schema.aprocess`. Fields that
+        do I/O or other slow work override this, so that they can be processed
+        concurrently. Otherwise, it just calls `process`.
+        """
+        return self.process(value, **kwargs)
+
+    @classmethod
+    def has_aprocess(cls) -> bool:
+        """
+        Does this field type have an `aprocess` of its own, which is not made
+        stale by a subclass overriding `process` below it?
+        """
+        return cls.aprocess is not Field.aprocess and issubclass(
+            defined_by(cls, 'aprocess'), defined_by(cls, 'process')
+        )
+
+    def compile_dumper(self) -> Callable:
+        """
+        Return a function that converts a processed, non-null value into
+        something that rapidjson encodes natively, or None if no conversion is
+        needed. See `SchemaEncoder`.
+        """
+        return None
+
+    def to_json_schema(self) -> typing.Dict:
+        """
+        Return a JSON Schema for the JSON values that `process` accepts. This
+        is a structural check: values that match may still be invalid.
+        """
+        return {}
+
+    def generate(self, *args, session: GenerationSession = None, **kwargs):
+        """
+        Generate a value for this field. If a session is given, it is active
+        for the duration of the call, including for any nested fields.
+        """
+        if session is None:
+            return self.generator.generate(self, *args, **kwargs)
+        with session:
+            return self.generator.generate(self, *args, **kwargs)
+
+    @property
+    def session(self) -> GenerationSession:
+        """
+        The current GenerationSession, for generating values.
+        """
+        return GenerationSession.get_current()
 
     @property
     def has_constant_default(self):
         return self._has_constant_default
 
+    def is_cacheable(self) -> bool:
+        """
+        Can results of processing this field be reused for identical source
+        values? Not if processing has side effects or depends on anything but
+        the value, like most callable defaults and custom hooks.
+        """
+        return (
+            self.cacheable and
+            (
+                not callable(self.default) or
+                (isinstance(self.default, type) and self.default in PURE_DEFAULTS)
+            ) and
+            self.before is Field.before and
+            self.after is Field.after
+        )
+
+    def spec(self) -> typing.Tuple:
+        """
+        Return a hashable description of how this field is configured, equal
+        for any two fields that would process values identically. Private
+        attributes, which are derived from public ones, are left out, except
+        for meta. Raises
+        TypeError if an attribute has an unhashable value.
+        """
+        field_type = type(self)
+        slot_names = SPEC_SLOTS.get(field_type)
+        if slot_names is None:
+            slot_names = set()
+            for base in field_type.__mro__:
+                slot_names.update(getattr(base, '__slots__', ()))
+            # meta is read from _meta, so that it isn't allocated needlessly
+            slot_names = SPEC_SLOTS[field_type] = tuple(
+                sorted(name for name in slot_names if not name.startswith('_'))
+            ) + ('_meta', )
+        names = slot_names
+        attrs = getattr(self, '__dict__', None)
+        if attrs:
+            names += tuple(sorted(k for k in attrs if not k.startswith('_')))
+
+        spec = [field_type]
+        for name in names:
+            value = getattr(self, name)
+            if type(value) not in SPEC_SCALAR_TYPES:
+                value = spec_value(self, value)
+            spec.append((name, value))
+        return tuple(spec)
+
     @classmethod
     def adapt(cls, on_adapt, **kwargs) -> FieldAdapter:
         return cls.Adapter(cls, on_adapt, **kwargs)
@@ -151,7 +436,7 @@ class Field(object):
         return (value, None)
 
     def on_generate(self, **kwargs):
-        p = random.randint(0, 10)
+        p = self.random.randint(0, 10)
 
         if p < 1:
             delegate = Bool()
@@ -193,8 +478,18 @@ class Enum(Field):
         else:
             return (nested_value, None)
 
+    def is_cacheable(self) -> bool:
+        return super().is_cacheable() and self.nested.is_cacheable()
+
+    def to_json_schema(self) -> typing.Dict:
+        # values can only be listed if the nested field doesn't coerce them
+        if type(self.nested) is String and all(isinstance(v, str) for v in self.values):
+            return {'type': 'string', 'enum': sorted(self.values)}
+        return self.nested.to_json_schema()
+
     def on_generate(self, **kwargs):
-        return random.choice(list(self.values))
+        # sorted, as set order varies between processes
+        return self.random.choice(sorted(self.values, key=repr))
 
 
 class String(Field):
@@ -223,7 +518,7 @@ class String(Field):
             'zipcode': lambda f, **kwargs: f.faker.zipcode(),
             'postal_code': lambda f, **kwargs: f.faker.zipcode(),
             'postalcode': lambda f, **kwargs: f.faker.zipcode(),
-            'year': lambda f, **kwargs: f.faker.year(),
+            'year': lambda f, **kwargs: f.session.date_time().strftime('%Y'),
             'user_name': lambda f, **kwargs: f.faker.user_name(),
             'username': lambda f, **kwargs: f.faker.user_name(),
             'nick': lambda f, **kwargs: f.faker.user_name(),
@@ -257,7 +552,7 @@ class String(Field):
             'host': lambda f, **kwargs: f.faker.hostname(),
             'hostname': lambda f, **kwargs: f.faker.hostname(),
             'host_name': lambda f, **kwargs: f.faker.hostname(),
-            'port': lambda f, **kwargs: str(random.randrange(1001, 10000)),
+            'port': lambda f, **kwargs: str(f.random.randrange(1001, 10000)),
             'ssn': lambda f, **kwargs: f.faker.ssn(),
             'ip_addr': lambda f, **kwargs: f.faker.ipv4(),
             'ip_address': lambda f, **kwargs: f.faker.ipv4(),
@@ -273,7 +568,7 @@ class String(Field):
             'mime': lambda f, **kwargs: f.faker.mime_type(),
             'mime_type': lambda f, **kwargs: f.faker.mime_type(),
             'mimetype': lambda f, **kwargs: f.faker.mime_type(),
-            'month': lambda f, **kwargs: f.faker.month(),
+            'month': lambda f, **kwargs: f.session.date_time().strftime('%m'),
             'isbn': lambda f, **kwargs: f.faker.isbn(),
             'slug': lambda f, **kwargs: f.faker.slug(),
             'street': lambda f, **kwargs: f.faker.street_name(),
@@ -295,9 +590,9 @@ class String(Field):
             'keyword': lambda f, **kwargs: f.faker.word().lower(),
             'tag': lambda f, **kwargs: f.faker.word().lower(),
             'headline': lambda f, **kwargs: f.faker.catch_phrase().title(),
-            'amount': lambda f, **kwargs: str(random.randrange(0, 51)),
-            'count': lambda f, **kwargs: str(random.randrange(0, 51)),
-            'angle': lambda f, **kwargs: str(random.randrange(-360, 361)),
+            'amount': lambda f, **kwargs: str(f.random.randrange(0, 51)),
+            'count': lambda f, **kwargs: str(f.random.randrange(0, 51)),
+            'angle': lambda f, **kwargs: str(f.random.randrange(-360, 361)),
             'password': lambda f, **kwargs: f.faker.password(),
         },
     )
@@ -310,6 +605,11 @@ class String(Field):
         else:
             return (value, UNRECOGNIZED_VALUE)
 
+    def to_json_schema(self) -> typing.Dict:
+        # scalars are converted with str, but arrays and objects are not
+        # considered to be strings here, even though process accepts them.
+        return {'type': ['string', 'number', 'boolean']}
+
     def on_generate(self, **kwargs):
         return self.faker.text(max_nb_chars=64)
 
@@ -356,21 +656,80 @@ class String(Field):
 
 
 class Bytes(Field):
+    """
+    # Bytes
+    Accepts bytes, str, which is encoded, and any object that supports the
+    buffer protocol, like bytearray, memoryview, array or mmap. Buffers are
+    read through a memoryview, so they are only copied when they have to be
+    converted to bytes. With `as_memoryview`, values are returned as flat,
+    unsigned byte memoryviews instead, and nothing is copied.
+    """
+
+    __slots__ = ('encoding', 'as_memoryview', 'max_length')
+
     np_dtype = 'S1'
 
-    def __init__(self, encoding='utf-8', *args, **kwargs):
+    def __init__(
+        self,
+        encoding='utf-8',
+        *args,
+        as_memoryview=False,
+        max_length: int = None,
+        **kwargs
+    ):
+        """
+        # Kwargs
+        - `encoding`: used to encode str values.
+        - `as_memoryview`: return a memoryview rather than bytes.
+        - `max_length`: max number of bytes, if set.
+        """
         super().__init__(*args, **kwargs)
         self.encoding = encoding
+        self.as_memoryview = as_memoryview
+        self.max_length = max_length
 
     def process(self, value):
         if isinstance(value, bytes):
-            return (value, None)
-        if isinstance(value, str):
-            return (value.encode(self.encoding), None)
-        return (None, UNRECOGNIZED_VALUE)
+            data = value
+        elif isinstance(value, str):
+            data = value.encode(self.encoding)
+        else:
+            try:
+                data = memoryview(value)
+            except TypeError:
+                return (None, UNRECOGNIZED_VALUE)
+            if data.ndim != 1 or data.format != 'B':
+                # e.g. arrays of ints or 2D buffers, viewed as raw bytes
+                if data.c_contiguous:
+                    data = data.cast('B')
+                else:
+                    data = memoryview(data.tobytes())
+
+        if self.max_length is not None and len(data) > self.max_length:
+            return (None, INVALID_VALUE)
+
+        if self.as_memoryview:
+            if type(data) is not memoryview:
+                data = memoryview(data)
+        elif type(data) is not bytes:
+            data = data.tobytes()
+
+        return (data, None)
+
+    def compile_dumper(self) -> Callable:
+        if self.as_memoryview:
+            return memoryview.tobytes
+        return None
+
+    def is_cacheable(self) -> bool:
+        # views can't be copied in and out of a cache
+        return super().is_cacheable() and not self.as_memoryview
+
+    def to_json_schema(self) -> typing.Dict:
+        return {'type': 'string'}
 
     def on_generate(self, **kwargs):
-        return self.faker.binary(1 << random.randint(5, 8))
+        return self.faker.binary(1 << self.random.randint(5, 8))
 
 
 class FormatString(String):
@@ -382,6 +741,8 @@ class FormatString(String):
 
 
 class Int(Field):
+    __slots__ = ('signed', )
+
     np_dtype = 'int64'
 
     generator = ValueGenerator(
@@ -390,24 +751,24 @@ class Int(Field):
             '_rev': lambda f, **kwargs: f.faker.random_number(digits=3),
             'id': lambda f, **kwargs: f.faker.random_number(digits=16),
             'public_id': lambda f, **kwargs: f.faker.random_number(digits=16),
-            'age': lambda f, **kwargs: random.randint(10, 100),
-            'rating': lambda f, **kwargs: random.randint(1, 10),
-            'width': lambda f, **kwargs: random.randint(0, 100),
-            'height': lambda f, **kwargs: random.randint(0, 100),
-            'size': lambda f, **kwargs: random.randint(0, 100),
-            'depth': lambda f, **kwargs: random.randint(0, 100),
-            'angle': lambda f, **kwargs: random.randint(-360, 360),
-            'year': lambda f, **kwargs: int(f.faker.year()),
-            'month': lambda f, **kwargs: int(f.faker.month()),
-            'day': lambda f, **kwargs: int(f.faker.day_of_month()),
-            'code': lambda f, **kwargs: random.randint(0, 20),
-            'seq': lambda f, **kwargs: random.randint(0, 100),
-            'no': lambda f, **kwargs: random.randint(0, 100),
-            'num': lambda f, **kwargs: random.randint(0, 100),
-            'count': lambda f, **kwargs: random.randint(0, 100),
-            'sequence': lambda f, **kwargs: random.randint(0, 1000),
-            'index': lambda f, **kwargs: random.randint(0, 1000),
-            'idx': lambda f, **kwargs: random.randint(0, 1000),
+            'age': lambda f, **kwargs: f.random.randint(10, 100),
+            'rating': lambda f, **kwargs: f.random.randint(1, 10),
+            'width': lambda f, **kwargs: f.random.randint(0, 100),
+            'height': lambda f, **kwargs: f.random.randint(0, 100),
+            'size': lambda f, **kwargs: f.random.randint(0, 100),
+            'depth': lambda f, **kwargs: f.random.randint(0, 100),
+            'angle': lambda f, **kwargs: f.random.randint(-360, 360),
+            'year': lambda f, **kwargs: f.session.date_time().year,
+            'month': lambda f, **kwargs: f.session.date_time().month,
+            'day': lambda f, **kwargs: f.session.date_time().day,
+            'code': lambda f, **kwargs: f.random.randint(0, 20),
+            'seq': lambda f, **kwargs: f.random.randint(0, 100),
+            'no': lambda f, **kwargs: f.random.randint(0, 100),
+            'num': lambda f, **kwargs: f.random.randint(0, 100),
+            'count': lambda f, **kwargs: f.random.randint(0, 100),
+            'sequence': lambda f, **kwargs: f.random.randint(0, 1000),
+            'index': lambda f, **kwargs: f.random.randint(0, 1000),
+            'idx': lambda f, **kwargs: f.random.randint(0, 1000),
         },
     )
 
@@ -429,8 +790,14 @@ class Int(Field):
         else:
             return (None, UNRECOGNIZED_VALUE)
 
+    def to_json_schema(self) -> typing.Dict:
+        integer = {'type': 'integer'}
+        if self.signed:
+            integer['minimum'] = 0
+        return {'anyOf': [integer, {'type': 'string', 'pattern': JSON_RE_INT}]}
+
     def on_generate(self, **kwargs):
-        return random.randint(-10, 100)
+        return self.random.randint(-10, 100)
 
     def on_generate_range(self, bounds: 'Bounds' = None, **kwargs):
         while True:
@@ -440,7 +807,7 @@ class Int(Field):
             upper = bounds.upper
             if not bounds.upper_inclusive:
                 upper -= 1
-            value = random.randint(lower, upper)
+            value = self.random.randint(lower, upper)
             if (not bounds.exclude) or (value not in bounds.exclude):
                 return value
 
@@ -452,7 +819,7 @@ class Uint(Int):
         super().__init__(signed=False, **kwargs)
 
     def on_generate(self, **kwargs):
-        return random.randint(0, 100)
+        return self.random.randint(0, 100)
 
 
 class Uint32(Uint):
@@ -483,20 +850,20 @@ class Float(Field):
         callbacks={
             '_id': lambda f, **kwargs: f.faker.random_number(digits=16),
             'public_id': lambda f, **kwargs: f.faker.random_number(digits=16),
-            'size': lambda f, **kwargs: 100 * random.random(),
-            'price': lambda f, **kwargs: 100 * random.random(),
-            'age': lambda f, **kwargs: random.randint(12, 80),
-            'width': lambda f, **kwargs: random.randint(0, 100),
-            'height': lambda f, **kwargs: random.randint(0, 100),
-            'depth': lambda f, **kwargs: random.randint(0, 100),
-            'angle': lambda f, **kwargs: random.randint(-360, 360),
-            'year': lambda f, **kwargs: int(f.faker.year()),
-            'month': lambda f, **kwargs: int(f.faker.month()),
-            'day': lambda f, **kwargs: int(f.faker.day_of_month()),
-            'code': lambda f, **kwargs: random.randint(0, 20),
-            'seq': lambda f, **kwargs: random.randint(0, 100),
-            'no': lambda f, **kwargs: random.randint(0, 100),
-            'num': lambda f, **kwargs: random.randint(0, 100),
+            'size': lambda f, **kwargs: 100 * f.random.random(),
+            'price': lambda f, **kwargs: 100 * f.random.random(),
+            'age': lambda f, **kwargs: f.random.randint(12, 80),
+            'width': lambda f, **kwargs: f.random.randint(0, 100),
+            'height': lambda f, **kwargs: f.random.randint(0, 100),
+            'depth': lambda f, **kwargs: f.random.randint(0, 100),
+            'angle': lambda f, **kwargs: f.random.randint(-360, 360),
+            'year': lambda f, **kwargs: f.session.date_time().year,
+            'month': lambda f, **kwargs: f.session.date_time().month,
+            'day': lambda f, **kwargs: f.session.date_time().day,
+            'code': lambda f, **kwargs: f.random.randint(0, 20),
+            'seq': lambda f, **kwargs: f.random.randint(0, 100),
+            'no': lambda f, **kwargs: f.random.randint(0, 100),
+            'num': lambda f, **kwargs: f.random.randint(0, 100),
         },
     )
 
@@ -513,8 +880,16 @@ class Float(Field):
         else:
             return (None, UNRECOGNIZED_VALUE)
 
+    def to_json_schema(self) -> typing.Dict:
+        return {
+            'anyOf': [
+                {'type': 'number'},
+                {'type': 'string', 'pattern': JSON_RE_FLOAT},
+            ]
+        }
+
     def on_generate(self, **kwargs):
-        return random.random() * random.randint(-100, 100)
+        return self.random.random() * self.random.randint(-100, 100)
 
 
 class Email(String):
@@ -522,11 +897,18 @@ class Email(String):
         dest, error = super().process(value)
         if error:
             return (dest, error)
-        elif not RE_EMAIL.match(value):
+        elif not RE_EMAIL.fullmatch(value):
             return (None, 'not a valid e-mail address')
         else:
             return (value.lower(), None)
 
+    def to_json_schema(self) -> typing.Dict:
+        """
+        The JSON Schema pattern accepts every address that `process` does,
+        and some it does not, with non-ASCII symbols or punctuation in them.
+        """
+        return {'type': 'string', 'pattern': JSON_RE_EMAIL}
+
     def on_generate(self, **kwargs):
         return self.faker.email()
 
@@ -548,12 +930,20 @@ class Uuid(Field):
         else:
             return (None, UNRECOGNIZED_VALUE)
 
+    def to_json_schema(self) -> typing.Dict:
+        return {
+            'anyOf': [
+                {'type': 'string', 'pattern': JSON_RE_UUID},
+                {'type': 'integer', 'minimum': 0},
+            ]
+        }
+
     def on_generate(self, **kwargs):
         return self.next_id()
 
     @classmethod
     def next_id(cls):
-        return uuid.uuid4()
+        return GenerationSession.get_current().uuid4()
 
 
 class UuidString(String):
@@ -573,12 +963,15 @@ class UuidString(String):
         else:
             return (None, UNRECOGNIZED_VALUE)
 
+    def to_json_schema(self) -> typing.Dict:
+        return Uuid.to_json_schema(self)
+
     def on_generate(self, **kwargs):
         return self.next_id()
 
     @classmethod
     def next_id(cls):
-        return UUID(int=random.getrandbits(128)).hex
+        return UUID(int=cls.random.getrandbits(128)).hex
 
 
 class Bool(Field):
@@ -600,11 +993,22 @@ class Bool(Field):
         else:
             return (None, UNRECOGNIZED_VALUE)
 
+    def to_json_schema(self) -> typing.Dict:
+        return {
+            'anyOf': [
+                {'type': 'boolean'},
+                {'enum': [0, 1]},
+                {'type': 'string', 'pattern': JSON_RE_BOOL},
+            ]
+        }
+
     def on_generate(self, **kwargs):
         return self.faker.boolean()
 
 
 class Numeric(Float):
+    __slots__ = ('precision', )
+
     def __init__(self, precision=None, **kwargs):
         super().__init__(**kwargs)
         self.precision = precision
@@ -620,6 +1024,7 @@ class Numeric(Float):
 
 
 class TimeDelta(Field):
+    __slots__ = ('unit', )
 
     RE_PATTERN_1 = re.compile(
         r'(?P<days>[-\d]+) day[s]*, (?P<hours>\d+):'
@@ -664,10 +1069,22 @@ class TimeDelta(Field):
                 pass
         return (None, 'invalid timedelta')
 
+    def to_json_schema(self) -> typing.Dict:
+        return {'type': ['number', 'string', 'object']}
+
 
 class DateTime(Field):
-    def __init__(self, tz=None, default=None, **kwargs):
+    __slots__ = ('tz', 'parse_cache')
+
+    def __init__(self, tz=None, default=None, parse_cache=False, **kwargs):
+        """
+        # Kwargs
+        - `tz`: timezone set on processed values, UTC by default.
+        - `default`: if True, default to the current UTC time.
+        - `parse_cache`: cache parsed datetime strings, for repeated values.
+        """
         self.tz = tz or pytz.utc
+        self.parse_cache = parse_cache
         if default is True:
             default = TimeUtils.utc_now
 
@@ -689,22 +1106,27 @@ class DateTime(Field):
             return (new_value, None)
         elif isinstance(value, str):
             try:
-                return (
-                    dateutil.parser.parse(value).replace(tzinfo=self.tz), None
-                )
-            except:
+                dt = TimeUtils.parse_datetime_string(value, self.parse_cache)
+            except (ValueError, OverflowError):
                 return (None, INVALID_VALUE)
+            return (dt.replace(tzinfo=self.tz), None)
         else:
             return (None, UNRECOGNIZED_VALUE)
 
+    def to_json_schema(self) -> typing.Dict:
+        return {'type': ['number', 'string']}
+
     def on_generate(self, **kwargs):
-        return self.faker.date_time_this_year(tzinfo=self.tz)
+        return self.session.date_time_this_year(tzinfo=self.tz)
 
 
 class DateTimeString(String):
-    def __init__(self, format_spec=None, timezone=None, **kwargs):
+    __slots__ = ('format_spec', 'parse_cache', 'timezone')
+
+    def __init__(self, format_spec=None, timezone=None, parse_cache=False, **kwargs):
         super().__init__(**kwargs)
         self.format_spec = format_spec
+        self.parse_cache = parse_cache
         if timezone is None:
             timezone = pytz.utc
         self.timezone = timezone
@@ -712,8 +1134,8 @@ class DateTimeString(String):
     def process(self, value):
         if isinstance(value, str):
             try:
-                dt = dateutil.parser.parse(value)
-            except:
+                dt = TimeUtils.parse_datetime_string(value, self.parse_cache)
+            except (ValueError, OverflowError):
                 return (None, INVALID_VALUE)
         elif isinstance(value, (int, float)):
             dt = TimeUtils.from_timestamp(value)
@@ -731,17 +1153,20 @@ class DateTimeString(String):
 
         return (dt_str, None)
 
+    def to_json_schema(self) -> typing.Dict:
+        return {'type': ['number', 'string']}
+
     def on_generate(self, **kwargs):
         if self.format_spec:
             return datetime.strftime(
-                self.faker.date_time_this_year(tzinfo=pytz.utc),
+                self.session.date_time_this_year(tzinfo=pytz.utc),
                 self.format_spec
             )
-        return self.faker.date_time_this_year(tzinfo=pytz.utc).isoformat()
+        return self.session.date_time_this_year(tzinfo=pytz.utc).isoformat()
 
 
 class Timestamp(Field):
-    np_dtype = 'int64'
+    np_dtype = 'float64'
 
     def process(self, value):
         if isinstance(value, (int, float)):
@@ -753,25 +1178,36 @@ class Timestamp(Field):
         else:
             return (None, UNRECOGNIZED_VALUE)
 
+    def to_json_schema(self) -> typing.Dict:
+        return {'type': 'number'}
+
     def on_generate(self, **kwargs):
         return TimeUtils.to_timestamp(
-            self.faker.date_time_this_year(tzinfo=pytz.utc)
+            self.session.date_time_this_year(tzinfo=pytz.utc)
         )
 
 
 class List(Field):
-    def __init__(self, nested: Field = None, **kwargs):
 
-        def on_create():
-            singular_name = StringUtils.singular(self.name)
-            self.nested.name = singular_name
-            self.nested.source = singular_name
-            self.np_dtype = self.nested.np_dtype
-            on_create_custom = kwargs.pop('on_create', None)
-            if on_create_custom:
-                on_create_custom()
-
-        super().__init__(on_create=on_create, **kwargs)
+    def __init__(
+        self,
+        nested: Field = None,
+        array_type: Text = None,
+        on_create: Callable = None,
+        **kwargs
+    ):
+        """
+        # Kwargs
+        - `nested`: the field, schema or dict of fields used for each item.
+        - `array_type`: if 'numpy' or 'array', processed sequences are returned
+          as a NumPy array or `array.array` of the nested field's np_dtype.
+          Sequences of Int, Float, Bool and Timestamp values are validated with
+          a single vectorized conversion, when NumPy is installed. Items out
+          of the range of the array's type are invalid.
+        - `on_create`: called once, after the nested field is named.
+        """
+        super().__init__(on_create=self.create_nested, **kwargs)
+        self.on_create_custom = on_create
 
         self.scalar = False
         self.nested = None
@@ -781,7 +1217,7 @@ class List(Field):
         if isinstance(nested, Nested):
             self.nested = nested.schema
         elif isinstance(nested, dict):
-            self.nested = Schema.factory('NestedSchema', nested)()
+            self.nested = Schema.factory('NestedSchema', nested, intern=True)()
         elif isinstance(nested, Field):
             self.nested = deepcopy(nested)
         elif callable(nested):
@@ -790,6 +1226,25 @@ class List(Field):
         else:
             self.nested = Schema()
 
+        if array_type not in (None, 'numpy', 'array'):
+            raise ValueError(f'unrecognized array_type: {array_type}')
+        if array_type == 'array' and self.nested.np_dtype not in ARRAY_TYPECODES:
+            raise ValueError(
+                f'no array typecode for np_dtype: {self.nested.np_dtype}'
+            )
+        self.array_type = array_type
+        self._vectorize = None
+
+    def create_nested(self):
+        singular_name = singular(self.name)
+        self.nested.name = singular_name
+        self.nested.source = singular_name
+        self.np_dtype = self.nested.np_dtype
+        on_create_custom = self.on_create_custom
+        if on_create_custom:
+            self.on_create_custom = None
+            on_create_custom()
+
     def __repr__(self):
         if self.name and self.source != self.name:
             load_to = ' -> ' + self.name
@@ -802,9 +1257,11 @@ class List(Field):
             self.nested.__class__.__name__,
         )
 
-    def process(self, sequence):
-        dest_sequence = []
-        idx2error = {}
+    def process(self, sequence, max_errors: int = None):
+        """
+        Process each item in the sequence, stopping once max_errors items have
+        failed, if set.
+        """
         if sequence is None:
             if self.nullable:
                 return (None, None)
@@ -813,21 +1270,157 @@ class List(Field):
 
         if isinstance(sequence, set):
             sequence = sorted(sequence)
+        if self.array_type is not None:
+            return self.process_array(sequence, max_errors)
+
+        dest_sequence, idx2error = self.process_items(sequence, max_errors)
+        if not idx2error:
+            return (dest_sequence, None)
+        else:
+            return (None, idx2error)
+
+    def process_items(self, sequence, max_errors: int = None):
+        dest_sequence = []
+        idx2error = {}
         for idx, value in enumerate(sequence):
             dest_val, err = self.nested.process(value)
             if not err:
                 dest_sequence.append(dest_val)
             else:
                 idx2error[idx] = err
+                if max_errors and len(idx2error) >= max_errors:
+                    break
+        return (dest_sequence, idx2error)
+
+    async def aprocess(self, sequence, max_errors: int = None):
+        """
+        Like `process`, but if the nested field has its own `aprocess`, like a
+        Nested schema, all items are processed concurrently. With max_errors,
+        they are processed one at a time instead, stopping once max_errors
+        items have failed.
+        """
+        if (
+            sequence is None or
+            self.array_type is not None or
+            not type(self.nested).has_aprocess()
+        ):
+            return self.process(sequence, max_errors=max_errors)
+
+        if isinstance(sequence, set):
+            sequence = sorted(sequence)
+
+        aprocess = self.nested.aprocess
+        dest_sequence = []
+        idx2error = {}
+        if max_errors:
+            for idx, value in enumerate(sequence):
+                dest_val, err = await aprocess(value)
+                if not err:
+                    dest_sequence.append(dest_val)
+                else:
+                    idx2error[idx] = err
+                    if len(idx2error) >= max_errors:
+                        break
+        else:
+            results = await asyncio.gather(*(aprocess(value) for value in sequence))
+            for idx, (dest_val, err) in enumerate(results):
+                if not err:
+                    dest_sequence.append(dest_val)
+                else:
+                    idx2error[idx] = err
 
         if not idx2error:
             return (dest_sequence, None)
         else:
             return (None, idx2error)
 
+    def process_array(self, sequence, max_errors: int = None):
+        """
+        Process the sequence into an array of the nested field's np_dtype,
+        with one vectorized conversion if possible, falling back to processing
+        each item when the nested field or the item types don't allow it.
+        """
+        if self._vectorize is None:
+            try:
+                from appyratus.schema.columns import VECTORIZERS
+
+                self._vectorize = VECTORIZERS.get(type(self.nested).process, False)
+            except ImportError:
+                self._vectorize = False
+
+        vectorized = None
+        if self._vectorize:
+            import numpy as np
+
+            dtype = np.dtype(self.nested.np_dtype)
+            try:
+                items = np.asarray(sequence)
+                # numpy casts mixed types to str, which process wouldn't
+                if items.ndim == 1 and not (
+                    items.dtype.kind == 'U' and
+                    not isinstance(sequence, np.ndarray) and
+                    not all(isinstance(v, str) for v in sequence)
+                ):
+                    vectorized = self._vectorize(self.nested, items, dtype)
+            except (OverflowError, TypeError, ValueError):
+                pass
+
+        if vectorized is None:
+            values, idx2error = self.process_items(sequence, max_errors)
+        else:
+            values, idx2error = vectorized
+            if max_errors and len(idx2error) > max_errors:
+                idx2error = dict(islice(idx2error.items(), max_errors))
+
+        if idx2error:
+            return (None, idx2error)
+        try:
+            return (self.to_array(values), None)
+        except (OverflowError, TypeError, ValueError):
+            pass
+
+        # find the items that the array's type can't hold, like ints that
+        # don't fit in an int64
+        idx2error = {}
+        for idx, value in enumerate(values):
+            try:
+                self.to_array([value])
+            except (OverflowError, TypeError, ValueError):
+                idx2error[idx] = INVALID_VALUE
+                if max_errors and len(idx2error) >= max_errors:
+                    break
+        return (None, idx2error or INVALID_VALUE)
+
+    def to_array(self, values):
+        if self.array_type == 'array':
+            typecode = ARRAY_TYPECODES[self.nested.np_dtype]
+            if isinstance(values, list):
+                return array.array(typecode, values)
+            result = array.array(typecode)
+            result.frombytes(values.tobytes())
+            return result
+
+        import numpy as np
+
+        return np.asarray(values, dtype=self.nested.np_dtype)
+
+    def compile_dumper(self) -> Callable:
+        if self.array_type is not None:
+            return lambda seq: seq.tolist()
+        dump = self.nested.compile_dumper()
+        if dump is None:
+            return None
+        return lambda seq: [None if v is None else dump(v) for v in seq]
+
+    def is_cacheable(self) -> bool:
+        return super().is_cacheable() and self.nested.is_cacheable()
+
+    def to_json_schema(self) -> typing.Dict:
+        return {'type': 'array', 'items': self.nested.to_json_schema()}
+
     def on_generate(self, **kwargs):
         return [
-            self.nested.generate() for _ in range(random.randint(1, 10))
+            self.nested.generate() for _ in range(self.random.randint(1, 10))
         ]
 
 
@@ -845,10 +1438,20 @@ class Set(List):
             self.nested.__class__.__name__,
         )
 
-    def process(self, sequence):
-        result, error = super().process(list(sequence))
+    def process(self, sequence, max_errors: int = None):
+        result, error = super().process(list(sequence), max_errors=max_errors)
         return ((set(result) if not error and result else result), error)
 
+    async def aprocess(self, sequence, max_errors: int = None):
+        result, error = await super().aprocess(list(sequence), max_errors=max_errors)
+        return ((set(result) if not error and result else result), error)
+
+    def compile_dumper(self) -> Callable:
+        dump = self.nested.compile_dumper()
+        if dump is None:
+            return list
+        return lambda seq: [None if v is None else dump(v) for v in seq]
+
 
 class Nested(Field):
     """
@@ -860,6 +1463,7 @@ class Nested(Field):
         })
     ```
     """
+
     def __init__(self, obj, **kwargs):
         super().__init__(**kwargs)
 
@@ -875,7 +1479,7 @@ class Nested(Field):
                 class_name = f'{name}Schema'
             else:
                 class_name = 'Schema'
-            self.schema_type = Schema.factory(class_name, obj)
+            self.schema_type = Schema.factory(class_name, obj, intern=True)
             self.schema = self.schema_type()
         elif isinstance(obj, Schema):
             self.schema = obj
@@ -894,8 +1498,20 @@ class Nested(Field):
             load_to = ''
         return '{}({}{})'.format(self.schema.__class__.__name__, self.source, load_to)
 
-    def process(self, value):
-        return self.schema.process(value)
+    def process(self, value, max_errors: int = None):
+        return self.schema.process(value, max_errors=max_errors)
+
+    async def aprocess(self, value, max_errors: int = None):
+        return await self.schema.aprocess(value, max_errors=max_errors)
+
+    def compile_dumper(self) -> Callable:
+        return self.schema.compile_dumper()
+
+    def is_cacheable(self) -> bool:
+        return super().is_cacheable() and self.schema.is_cacheable()
+
+    def to_json_schema(self) -> typing.Dict:
+        return self.schema.to_json_schema()
 
     def on_generate(self, **kwargs):
         return self.schema.generate()
@@ -914,7 +1530,7 @@ class Dict(Field):
             # assume is JSON end decode it
             from appyratus.json import JsonEncoder
 
-            json = JsonEncoder()
+            json = JsonEncoder.get_instance()
             try:
                 value = json.decode(value)
                 if not isinstance(value, dict):
@@ -925,6 +1541,10 @@ class Dict(Field):
         else:
             return (None, UNRECOGNIZED_VALUE)
 
+    def to_json_schema(self) -> typing.Dict:
+        # strings are decoded as JSON objects
+        return {'type': ['object', 'string']}
+
     def on_generate(self, **kwargs):
         return self.faker.pydict()
 
@@ -951,7 +1571,7 @@ class IpAddress(String):
     # IPv4/6
     """
     def on_generate(self, **kwargs):
-        if random.randint(1, 10) < 3:
+        if self.random.randint(1, 10) < 3:
             return self.faker.ipv6()
         else:
             return self.faker.ipv4()
@@ -974,18 +1594,58 @@ class Url(String):
 
 
 class BcryptString(String):
+    """
+    # Bcrypt String
+    Hash string values with bcrypt, unless they are already bcrypt hashes.
+    Hashing is slow by design, so `aprocess` and `hash_str.averify` offload it
+    to a shared thread pool, where bcrypt runs without holding the GIL.
+    """
+
+    __slots__ = ('rounds', )
+
     encoding = 'utf8'
+    cacheable = False
+    _executor = None
+    _executor_lock = threading.Lock()
 
     class hash_str(str):
         def __eq__(self, other: str):
+            return self.verify(other)
+
+        def verify(self, other: str) -> bool:
             return bcrypt.checkpw(
                 other.encode(BcryptString.encoding), self.encode(BcryptString.encoding)
             )
 
+        async def averify(self, other: str) -> bool:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                BcryptString.get_executor(), self.verify, other
+            )
+
     def __init__(self, rounds=14, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.rounds = rounds
 
+    @staticmethod
+    def get_executor() -> ThreadPoolExecutor:
+        """
+        Get the thread pool shared by all BcryptString fields.
+        """
+        if BcryptString._executor is None:
+            with BcryptString._executor_lock:
+                if BcryptString._executor is None:
+                    BcryptString._executor = ThreadPoolExecutor(
+                        thread_name_prefix='bcrypt'
+                    )
+        return BcryptString._executor
+
+    def hash(self, value: Text) -> 'hash_str':
+        salt = bcrypt.gensalt(self.rounds)
+        raw_hash_enc = bcrypt.hashpw(value.encode(self.encoding), salt)
+        raw_hash = raw_hash_enc.decode(self.encoding)
+        return self.hash_str(raw_hash)
+
     def process(self, value):
         value, error = super().process(value)
         if error:
@@ -993,11 +1653,24 @@ class BcryptString(String):
         elif RE_BCRYPT_HASH.match(value):
             return (self.hash_str(value), None)
 
-        salt = bcrypt.gensalt(self.rounds)
-        raw_hash_enc = bcrypt.hashpw(value.encode(self.encoding), salt)
-        raw_hash = raw_hash_enc.decode(self.encoding)
+        return (self.hash(value), None)
+
+    async def aprocess(self, value):
+        """
+        Like `process`, but hashing runs in the shared thread pool, so the
+        event loop isn't blocked.
+        """
+        value, error = super().process(value)
+        if error:
+            return (None, error)
+        elif RE_BCRYPT_HASH.match(value):
+            return (self.hash_str(value), None)
 
-        return (self.hash_str(raw_hash), None)
+        loop = asyncio.get_running_loop()
+        hashed = await loop.run_in_executor(
+            self.get_executor(), self.hash, value
+        )
+        return (hashed, None)
 
     def on_generate(self, **kwargs):
         # hash for password: "password"
@@ -1,12 +1,129 @@
+import random
 import re
+import uuid
 
 import inflect
 
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import partial
 from types import MethodType
 from typing import Type, Callable, Text, Dict, List, Set
 
+from faker import Faker
+
 RE_FIELD_NAME_SUFFIX = re.compile(r'^.+_([^_]+)$')
 
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# the time that seeded sessions generate dates relative to, instead of the
+# current time, so that their output doesn't change with the clock.
+SEEDED_NOW = datetime(2024, 7, 1, tzinfo=timezone.utc)
+
+
+class GenerationSession(object):
+    """
+    # Generation Session
+    The source of randomness used while generating values for fields. Inside
+    of a `with session:` block, or when passed to `Field.generate`, fields
+    draw from the session's own seeded RNG and Faker instance, so output is
+    reproducible and independent of other threads and tasks. Outside of any
+    session, the global `random` module and a shared Faker are used.
+
+    Generated dates are relative to `now`, which is SEEDED_NOW in seeded
+    sessions, and the current time otherwise.
+    """
+
+    _current = ContextVar('generation_session', default=None)
+    _default = None
+
+    def __init__(
+        self,
+        seed=None,
+        rng: random.Random = None,
+        faker: Faker = None,
+        now: datetime = None,
+    ):
+        self.seed = seed
+        self.random = rng or random.Random(seed)
+        self.faker = faker or Faker()
+        if faker is None:
+            self.faker.seed_instance(seed)
+        if now is None and seed is not None:
+            now = SEEDED_NOW
+        self.now = now
+        self._tokens = []
+
+    def __enter__(self):
+        self._tokens.append(self._current.set(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._current.reset(self._tokens.pop())
+
+    @classmethod
+    def get_default(cls) -> 'GenerationSession':
+        if GenerationSession._default is None:
+            GenerationSession._default = cls(rng=random, faker=Faker())
+        return GenerationSession._default
+
+    @classmethod
+    def get_current(cls) -> 'GenerationSession':
+        return cls._current.get() or cls.get_default()
+
+    def reseed(self, seed):
+        """
+        Reset the RNG and Faker instance with a new seed.
+        """
+        self.seed = seed
+        self.random.seed(seed)
+        self.faker.seed_instance(seed)
+        if self.now is None and seed is not None:
+            self.now = SEEDED_NOW
+
+    def uuid4(self) -> uuid.UUID:
+        """
+        Return a random version 4 UUID. The default session uses the OS's
+        random source, like `uuid.uuid4`.
+        """
+        if self is GenerationSession._default:
+            return uuid.uuid4()
+        return uuid.UUID(int=self.random.getrandbits(128), version=4)
+
+    def date_time(self, tzinfo=None) -> datetime:
+        """
+        Return a random datetime between the epoch and now, like Faker's
+        `date_time`.
+        """
+        if self.now is None:
+            return self.faker.date_time(tzinfo=tzinfo)
+        return self.faker.date_time_between_dates(EPOCH, self.now, tzinfo=tzinfo)
+
+    def date_time_this_year(self, tzinfo=None) -> datetime:
+        """
+        Return a random datetime between the start of this year and now,
+        like Faker's `date_time_this_year`.
+        """
+        if self.now is None:
+            return self.faker.date_time_this_year(tzinfo=tzinfo)
+        year_start = self.now.replace(
+            month=1, day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        return self.faker.date_time_between_dates(year_start, self.now, tzinfo=tzinfo)
+
+
+class session_attribute(object):
+    """
+    Class attribute that resolves to the attribute of the same name on the
+    current GenerationSession.
+    """
+
+    def __init__(self, name: Text):
+        self.name = name
+
+    def __get__(self, obj, owner):
+        return getattr(GenerationSession.get_current(), self.name)
+
 
 class Bounds(object):
     def __init__(
@@ -34,6 +151,8 @@ class ValueGenerator(object):
         self.default = default or (lambda field, *args, **kwargs: None)
         self.callbacks = callbacks or {}
         self.inflect = inflect.engine()
+        # field name -> resolved callback, where None means on_generate
+        self._resolved = {}
 
     def register(self, field_name: Text, callback: Callable):
         """
@@ -41,12 +160,15 @@ class ValueGenerator(object):
         triggers the callback.
         """
         self.callbacks[field_name] = callback
+        self._resolved.clear()
 
     def unregister(self, field_name: Text) -> Callable:
         """
         Unregister a callback.
         """
-        return self.callbacks.pop(field_name, None)
+        callback = self.callbacks.pop(field_name, None)
+        self._resolved.clear()
+        return callback
 
     def generate(
         self,
@@ -58,22 +180,10 @@ class ValueGenerator(object):
         Apply a callback to generate a value for the given field, using its name
         to determine the callback.
         """
-        if field.name is None or (bounds is not None):
-            if bounds is None:
-                func = field.on_generate
-            else:
-                func = field.on_generate_range
-                kwargs['bounds'] = bounds
-        else:
-            func = self.callbacks.get(field.name, field.on_generate)
-            if func is self.default:
-                singular_name = self.inflect.singular_noun(field.name)
-                func = self.callbacks.get(singular_name, self.default)
-            if func is self.default:
-                match = RE_FIELD_NAME_SUFFIX.match(field.name)
-                if match:
-                    name = match.groups()[0]
-                    func = self.callbacks.get(name, field.on_generate)
+        if bounds is not None:
+            kwargs['bounds'] = bounds
+
+        func = self.resolve_func(field, bounds)
 
         # if func resolves to the instance method, don't pass "field"
         # as the first positional argument to the on_generate* callback
@@ -84,3 +194,48 @@ class ValueGenerator(object):
             return func(**kwargs)
         else:
             return func(field, **kwargs)
+
+    def resolve(self, field: 'Field', bounds: Bounds = None) -> Callable:
+        """
+        Return a function that generates a value for the given field each time
+        it is called. This is useful for generating many values in a loop.
+        """
+        func = self.resolve_func(field, bounds)
+        if not (
+            isinstance(func, MethodType) and
+            isinstance(func.__self__, type(field))
+        ):
+            func = partial(func, field)
+        if bounds is not None:
+            func = partial(func, bounds=bounds)
+        return func
+
+    def resolve_func(self, field: 'Field', bounds: Bounds = None) -> Callable:
+        """
+        Return the callback or on_generate method to use for the given field.
+        Callbacks resolved by field name are cached until the next call to
+        `register` or `unregister`.
+        """
+        if field.name is None or (bounds is not None):
+            if bounds is None:
+                return field.on_generate
+            else:
+                return field.on_generate_range
+
+        try:
+            func = self._resolved[field.name]
+        except KeyError:
+            func = self._resolved[field.name] = self._resolve_name(field.name)
+
+        return field.on_generate if func is None else func
+
+    def _resolve_name(self, name: Text) -> Callable:
+        func = self.callbacks.get(name)
+        if func is self.default:
+            singular_name = self.inflect.singular_noun(name)
+            func = self.callbacks.get(singular_name, self.default)
+        if func is self.default:
+            match = RE_FIELD_NAME_SUFFIX.match(name)
+            if match:
+                func = self.callbacks.get(match.groups()[0])
+        return func
@@ -0,0 +1,215 @@
+import threading
+import time
+
+from collections import Counter
+from functools import wraps
+from inspect import isawaitable
+from typing import Callable, Dict, Text, Tuple
+
+# errors that aren't strings, like those of List and Nested fields, are
+# counted as this kind.
+NESTED_ERROR = 'nested'
+
+
+class FieldStats(object):
+    """
+    Call count, latency and error counts for one stage of processing a field.
+    """
+
+    __slots__ = ('calls', 'total_time', 'max_time', 'errors')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.errors = Counter()
+
+    def __repr__(self):
+        return (
+            f'{type(self).__name__}(calls={self.calls}, '
+            f'total_time={self.total_time:.6f}, errors={sum(self.errors.values())})'
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            'calls': self.calls,
+            'total_seconds': self.total_time,
+            'max_seconds': self.max_time,
+            'mean_seconds': (self.total_time / self.calls) if self.calls else 0.0,
+            'errors': dict(self.errors),
+        }
+
+
+class SchemaMetrics(object):
+    """
+    # Schema Metrics
+    Collects the number of calls, cumulative and max latency and error counts
+    of `Field.process` and of the `before` and `after` hooks of each field
+    of the instrumented Schema classes. Errors are counted by their string,
+    like "unrecognized" or "invalid".
+
+    Stats are kept per Schema class, and reported by class name. Classes
+    that share a name, like those built by `Schema.factory`, are told apart
+    by a suffix, like "NestedSchema#2", in the order they were instrumented.
+
+    Instrumentation is opt-in, per Schema class. The class's processor is
+    recompiled with timed versions of each step, so uninstrumented schemas
+    pay nothing. Results served by a `ResultCache` are not counted.
+
+    # Usage
+    ```python
+    metrics = UserSchema.instrument()
+    UserSchema().process(record)
+    metrics.to_dict()['UserSchema']['email']['process']['errors']
+    print(metrics.to_prometheus())
+    ```
+    """
+
+    def __init__(self):
+        self.stats = {}
+        self._names = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f'{type(self).__name__}(size={len(self.stats)})'
+
+    def get_stats(self, schema_type: type, field_name: Text, stage: Text) -> FieldStats:
+        key = (schema_type, field_name, stage)
+        stats = self.stats.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self.stats.get(key)
+                if stats is None:
+                    stats = self.stats[key] = FieldStats()
+                    if schema_type not in self._names:
+                        self._names[schema_type] = self._make_name(schema_type)
+        return stats
+
+    def get_name(self, schema_type: type) -> Text:
+        """
+        Return the name that the Schema class's stats are reported under.
+        """
+        return self._names[schema_type]
+
+    def _make_name(self, schema_type: type) -> Text:
+        name = schema_type.__name__
+        taken = set(self._names.values())
+        count = 1
+        unique_name = name
+        while unique_name in taken:
+            count += 1
+            unique_name = f'{name}#{count}'
+        return unique_name
+
+    def wrap(
+        self,
+        schema_type: type,
+        field_name: Text,
+        stage: Text,
+        func: Callable,
+    ) -> Callable:
+        """
+        Return a version of a field's process method or hook that records
+        its latency and errors. Each of these returns a (value, error) tuple,
+        or an awaitable one, which is timed until it is done.
+        """
+        stats = self.get_stats(schema_type, field_name, stage)
+        errors = stats.errors
+        lock = self._lock
+        clock = time.perf_counter
+
+        def record(started, result):
+            elapsed = clock() - started
+            error = result[1]
+            with lock:
+                stats.calls += 1
+                stats.total_time += elapsed
+                if elapsed > stats.max_time:
+                    stats.max_time = elapsed
+                if error:
+                    errors[error if isinstance(error, str) else NESTED_ERROR] += 1
+            return result
+
+        async def record_awaited(started, awaitable):
+            return record(started, await awaitable)
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            started = clock()
+            result = func(*args, **kwargs)
+            if isawaitable(result):
+                return record_awaited(started, result)
+            return record(started, result)
+
+        return timed
+
+    def reset(self):
+        """
+        Zero all stats, keeping instrumented fields in place.
+        """
+        with self._lock:
+            for stats in self.stats.values():
+                stats.__init__()
+
+    def to_dict(self) -> Dict:
+        """
+        Return a snapshot of all stats, nested by schema, field and stage.
+        """
+        snapshot = {}
+        with self._lock:
+            for (schema_name, field_name, stage), stats in self._named_stats():
+                schema_stats = snapshot.setdefault(schema_name, {})
+                field_stats = schema_stats.setdefault(field_name, {})
+                field_stats[stage] = stats.to_dict()
+        return snapshot
+
+    def to_prometheus(self, prefix: Text = 'appyratus_schema_field') -> Text:
+        """
+        Return a snapshot of all stats in the Prometheus text exposition
+        format, labeled by schema, field and stage.
+        """
+        metrics = (
+            ('calls_total', 'counter', 'Number of calls.'),
+            ('seconds_total', 'counter', 'Cumulative time spent, in seconds.'),
+            ('seconds_max', 'gauge', 'Longest single call, in seconds.'),
+            ('errors_total', 'counter', 'Number of errors, by error.'),
+        )
+        samples = {name: [] for name, _, _ in metrics}
+        with self._lock:
+            for key, stats in self._named_stats():
+                labels = self._format_labels(key)
+                samples['calls_total'].append((labels, stats.calls))
+                samples['seconds_total'].append((labels, stats.total_time))
+                samples['seconds_max'].append((labels, stats.max_time))
+                for error, count in sorted(stats.errors.items()):
+                    error_labels = self._format_labels(key, error)
+                    samples['errors_total'].append((error_labels, count))
+
+        lines = []
+        for name, metric_type, help_text in metrics:
+            metric_name = f'{prefix}_{name}'
+            lines.append(f'# HELP {metric_name} {help_text}')
+            lines.append(f'# TYPE {metric_name} {metric_type}')
+            for labels, value in samples[name]:
+                lines.append(f'{metric_name}{{{labels}}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def _named_stats(self):
+        # stats keyed by schema name rather than class, in order
+        names = self._names
+        return sorted(
+            ((names[schema_type], field_name, stage), stats)
+            for (schema_type, field_name, stage), stats in self.stats.items()
+        )
+
+    @staticmethod
+    def _format_labels(key: Tuple, error: Text = None) -> Text:
+        names = ('schema', 'field', 'stage', 'error')
+        values = key if error is None else key + (error, )
+        return ','.join(
+            '{}="{}"'.format(
+                name,
+                str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n'),
+            )
+            for name, value in zip(names, values)
+        )
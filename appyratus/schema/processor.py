@@ -0,0 +1,428 @@
+import asyncio
+
+from copy import deepcopy
+from functools import lru_cache
+from inspect import isawaitable, signature
+from typing import Callable, Dict, Text, Tuple
+
+from .fields import Field
+
+# default values of these types are returned as-is instead of deep-copied
+IMMUTABLE_TYPES = (str, bytes, int, float, bool, complex, frozenset)
+
+
+@lru_cache(maxsize=1024)
+def _takes_max_errors(func: Callable) -> bool:
+    try:
+        return 'max_errors' in signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def takes_max_errors(method: Callable) -> bool:
+    """
+    Does the field method take a max_errors kwarg, limiting the errors it
+    collects? This is read from its signature, as subclasses of fields that
+    do, like List, may override it with one that doesn't.
+    """
+    return _takes_max_errors(getattr(method, '__func__', method))
+
+
+class SchemaProcessor(object):
+    """
+    # Schema Processor
+    A processor is compiled once per Schema class. All per-field constants
+    (keys, defaults, flags, hooks and bound `process` methods) are resolved up
+    front into flat tuples, so that the per-record loop in `process` does no
+    attribute lookups and skips hooks that are just the default `Field` stubs.
+    If the Schema class is instrumented, the field methods and hooks are
+    wrapped by its `SchemaMetrics` at this point.
+    """
+
+    def __init__(self, schema_type: type, fields: Dict = None):
+        self.schema_type = schema_type
+        self.fields = dict(schema_type.fields if fields is None else fields)
+        self.metrics = getattr(schema_type, 'metrics', None)
+        self.steps = tuple(
+            self.compile_field(f, self.metrics, schema_type)
+            for f in self.fields.values()
+        )
+        self.keys = tuple(step[2] for step in self.steps)
+        self.needs_context = any(
+            (step[5] is not None) or (step[11] is not None and step[11][3])
+            for step in self.steps
+        )
+        self._cacheable = None
+        self._aprocesses = None
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.schema_type.__name__})'
+
+    @property
+    def cacheable(self) -> bool:
+        """
+        Are the results of `process` a function of the source alone? See
+        `Field.is_cacheable`.
+        """
+        if self._cacheable is None:
+            # assume not while checking, in case the schema nests itself
+            self._cacheable = False
+            self._cacheable = all(
+                field.is_cacheable() for field in self.fields.values()
+            )
+        return self._cacheable
+
+    @property
+    def aprocesses(self) -> Tuple:
+        """
+        An `(aprocess, takes_max_errors)` tuple for each field that has its own
+        `aprocess` method, or None, in the same order as steps. A field's
+        aprocess is not used if its class overrides process below it. Compiled
+        on first use by `aprocess`.
+        """
+        if self._aprocesses is None:
+            schema_type = self.schema_type
+            aprocesses = []
+            for field in self.fields.values():
+                entry = None
+                if type(field).has_aprocess():
+                    aprocess = field.aprocess
+                    accepts_max_errors = takes_max_errors(aprocess)
+                    if self.metrics is not None:
+                        aprocess = self.metrics.wrap(
+                            schema_type, field.name, 'process', aprocess
+                        )
+                    entry = (aprocess, accepts_max_errors)
+                aprocesses.append(entry)
+            self._aprocesses = tuple(aprocesses)
+        return self._aprocesses
+
+    @staticmethod
+    def compile_default(field: Field):
+        """
+        Return a function that generates the field's default value, or None if
+        the field has no default.
+        """
+        default = field.default
+        if default is None:
+            return None
+        if callable(default):
+            return default
+        if isinstance(default, IMMUTABLE_TYPES):
+            return lambda: default
+        return lambda: deepcopy(default)
+
+    @classmethod
+    def compile_field(
+        cls,
+        field: Field,
+        metrics: 'SchemaMetrics' = None,
+        schema_type: type = None,
+    ) -> Tuple:
+        name = field.name
+        nullable = bool(field.nullable)
+        nullable_msg = f'{name} not nullable'
+        process = field.process
+        accepts_max_errors = takes_max_errors(process)
+
+        before = field.before
+        if before is Field.before:
+            before = None
+
+        after = field.after
+        has_after = after is not None and after is not Field.after
+
+        if metrics is not None:
+            process = metrics.wrap(schema_type, name, 'process', process)
+            if before is not None:
+                before = metrics.wrap(schema_type, name, 'before', before)
+            if has_after:
+                after = metrics.wrap(schema_type, name, 'after', after)
+
+        if after is None:
+            post = None
+        else:
+            post = (field, name, nullable, has_after, after, nullable_msg)
+
+        return (
+            field,
+            name,
+            field.source or field.name,
+            field.source,
+            process,
+            before,
+            cls.compile_default(field),
+            nullable,
+            bool(field.required),
+            f'{name} is required',
+            nullable_msg,
+            post,
+            accepts_max_errors,
+        )
+
+    def process(
+        self,
+        source,
+        dest: Dict,
+        context=None,
+        ignore_required=False,
+        ignore_nullable=False,
+        max_errors: int = None,
+    ) -> Tuple[Dict, Dict]:
+        """
+        Marshal each value in the "source" dict into the "dest" dict, returning
+        the dest dict along with a dict of errors, keyed by field name. If
+        max_errors is set, processing stops as soon as that many errors have
+        been found, and it is passed on to fields that accept it, like `List`,
+        as their own budget.
+        """
+        errors = {}
+        post_steps = []
+
+        if not isinstance(source, dict):
+            # only key membership matters for non-dict sources. all source
+            # values are considered to be None.
+            if source is None:
+                source = {}
+            else:
+                source = {k: None for k in self.keys if k in source}
+
+        source_get = source.get
+
+        for (
+            field, name, key, value_key, process, before, get_default,
+            nullable, required, required_msg, nullable_msg, post,
+            accepts_max_errors,
+        ) in self.steps:
+            if max_errors and len(errors) >= max_errors:
+                break
+
+            exists_key = key in source
+            source_val = source_get(value_key)
+
+            if before is not None:
+                source_val, source_err = before(
+                    field, source_val, context=context
+                )
+                if source_err:
+                    errors[name] = source_err
+
+            if not exists_key:
+                # source key not present but required. try to generate
+                # default value if possible or error.
+                if get_default is not None:
+                    source_val = get_default()
+                elif required and not ignore_required:
+                    errors[name] = required_msg
+                    continue
+                else:
+                    continue
+
+            if source_val is None:
+                if get_default is not None:
+                    source_val = get_default()
+                if not nullable:
+                    if source_val is not None:
+                        dest[name] = source_val
+                    elif not ignore_nullable:
+                        errors[name] = nullable_msg
+                    continue
+                else:
+                    dest[name] = None
+                    continue
+
+            # apply field to the source value
+            if max_errors and accepts_max_errors:
+                dest_val, field_err = process(
+                    source_val, max_errors=max_errors - len(errors)
+                )
+            else:
+                dest_val, field_err = process(source_val)
+
+            if not field_err:
+                dest[name] = dest_val
+            else:
+                errors[name] = field_err
+
+            if post is not None:
+                post_steps.append(post)
+
+        # call all post-process callbacks, skipping calls to stubs
+        dest_pop = dest.pop
+        for field, name, nullable, has_after, after, nullable_msg in post_steps:
+            if max_errors and len(errors) >= max_errors:
+                break
+            dest_val = dest_pop(name, None)
+            if has_after:
+                field_val, field_err = after(
+                    field, dest_val, dest, context=context
+                )
+            else:
+                field_val, field_err = dest_val, None
+            # now recheck nullity of the post-processed field value
+            if dest_val is None and not (nullable or ignore_nullable):
+                errors[name] = nullable_msg
+            elif not field_err:
+                dest[name] = field_val
+            else:
+                errors[name] = field_err
+
+        return (dest, errors)
+
+    async def aprocess(
+        self,
+        source,
+        dest: Dict,
+        context=None,
+        ignore_required=False,
+        ignore_nullable=False,
+        max_errors: int = None,
+    ) -> Tuple[Dict, Dict]:
+        """
+        Like `process`, but hooks may return awaitables, and fields with their
+        own `aprocess` method, like Nested schemas, are processed with it. The
+        before hooks of all fields run concurrently, and then so do the fields.
+        After hooks run one at a time, in field order, as each one can see the
+        results of the others. With max_errors, nothing runs concurrently:
+        hooks and fields are awaited one at a time, in field order, so that
+        nothing more runs once the budget is spent, as in `process`.
+        """
+        errors = {}
+        post_steps = []
+        pending = []
+        concurrent = not max_errors
+
+        if not isinstance(source, dict):
+            if source is None:
+                source = {}
+            else:
+                source = {k: None for k in self.keys if k in source}
+
+        source_get = source.get
+        steps = self.steps
+        aprocesses = self.aprocesses
+
+        # run before hooks first, as their results are needed up front
+        before_results = {}
+        awaiting = []
+        for idx, step in enumerate(steps if concurrent else ()):
+            before = step[5]
+            if before is not None:
+                result = before(step[0], source_get(step[3]), context=context)
+                if isawaitable(result):
+                    awaiting.append((idx, result))
+                else:
+                    before_results[idx] = result
+        if awaiting:
+            results = await asyncio.gather(*(aw for _, aw in awaiting))
+            before_results.update(zip((idx for idx, _ in awaiting), results))
+
+        for idx, (
+            field, name, key, value_key, process, before, get_default,
+            nullable, required, required_msg, nullable_msg, post,
+            accepts_max_errors,
+        ) in enumerate(steps):
+            if max_errors and len(errors) >= max_errors:
+                break
+
+            exists_key = key in source
+
+            if before is not None:
+                if concurrent:
+                    source_val, source_err = before_results[idx]
+                else:
+                    source_val, source_err = await self.resolve(
+                        before(field, source_get(value_key), context=context)
+                    )
+                if source_err:
+                    errors[name] = source_err
+            else:
+                source_val = source_get(value_key)
+
+            if not exists_key:
+                if get_default is not None:
+                    source_val = get_default()
+                elif required and not ignore_required:
+                    errors[name] = required_msg
+                    continue
+                else:
+                    continue
+
+            if source_val is None:
+                if get_default is not None:
+                    source_val = get_default()
+                if not nullable:
+                    if source_val is not None:
+                        dest[name] = source_val
+                    elif not ignore_nullable:
+                        errors[name] = nullable_msg
+                    continue
+                else:
+                    dest[name] = None
+                    continue
+
+            entry = aprocesses[idx]
+            if entry is not None:
+                process, accepts_max_errors = entry
+            if max_errors and accepts_max_errors:
+                kwargs = {'max_errors': max_errors - len(errors)}
+            else:
+                kwargs = {}
+
+            if entry is not None and concurrent:
+                # hold the field's place in dest until it's done
+                reserved = name not in dest
+                if reserved:
+                    dest[name] = None
+                pending.append((name, reserved, process(source_val, **kwargs)))
+            else:
+                if entry is not None:
+                    dest_val, field_err = await process(source_val, **kwargs)
+                else:
+                    dest_val, field_err = process(source_val, **kwargs)
+                if not field_err:
+                    dest[name] = dest_val
+                else:
+                    errors[name] = field_err
+
+            if post is not None:
+                post_steps.append(post)
+
+        if pending:
+            results = await asyncio.gather(*(aw for _, _, aw in pending))
+            for (name, reserved, _), (dest_val, field_err) in zip(pending, results):
+                if not field_err:
+                    dest[name] = dest_val
+                else:
+                    if reserved:
+                        del dest[name]
+                    errors[name] = field_err
+
+        dest_pop = dest.pop
+        for field, name, nullable, has_after, after, nullable_msg in post_steps:
+            if max_errors and len(errors) >= max_errors:
+                break
+            dest_val = dest_pop(name, None)
+            if has_after:
+                field_val, field_err = await self.resolve(
+                    after(field, dest_val, dest, context=context)
+                )
+            else:
+                field_val, field_err = dest_val, None
+            if dest_val is None and not (nullable or ignore_nullable):
+                errors[name] = nullable_msg
+            elif not field_err:
+                dest[name] = field_val
+            else:
+                errors[name] = field_err
+
+        return (dest, errors)
+
+    @staticmethod
+    async def resolve(result):
+        """
+        Return the result of a hook, awaiting it first if necessary.
+        """
+        if isawaitable(result):
+            return await result
+        return result
@@ -0,0 +1,134 @@
+from typing import Dict, Text
+
+from .exc import ValidationError
+
+
+class SchemaRecord(object):
+    """
+    # Schema Record
+    A mutable source dict paired with the results of processing it with a
+    schema. Changes made through the record mark the affected fields as
+    dirty, and `validate` only re-processes the dirty fields, reusing the
+    previous results for all others.
+
+    Schemas with their own `before` or `after` hooks or that allow additional
+    keys are processed in full every time, as these depend on the record as a
+    whole. Values mutated in place must be marked dirty with `touch`.
+
+    # Usage
+    ```python
+    record = SchemaRecord(UserSchema(), {'name': 'Sisko', 'rank': 'captain'})
+    data, errors = record.validate()
+    record['rank'] = 'admiral'
+    data, errors = record.validate()   # only processes rank
+    ```
+    """
+
+    def __init__(self, schema: 'Schema', source: Dict = None, context: Dict = None):
+        processor = type(schema).get_processor()
+        self.schema = schema
+        self.context = context
+        self.source = dict(source or {})
+        self.data = {}
+        self.errors = {}
+        self.dirty = set(processor.fields)
+        self._names_by_key = {}
+        for name, key in zip(processor.fields, processor.keys):
+            self._names_by_key.setdefault(key, []).append(name)
+
+    def __repr__(self):
+        return (
+            f'{type(self).__name__}({type(self.schema).__name__}, '
+            f'dirty={sorted(self.dirty)})'
+        )
+
+    def __getitem__(self, key: Text):
+        return self.source[key]
+
+    def __setitem__(self, key: Text, value):
+        self.source[key] = value
+        self.dirty.update(self._names_by_key.get(key, ()))
+
+    def __delitem__(self, key: Text):
+        del self.source[key]
+        self.dirty.update(self._names_by_key.get(key, ()))
+
+    def __contains__(self, key: Text) -> bool:
+        return key in self.source
+
+    def get(self, key: Text, default=None):
+        return self.source.get(key, default)
+
+    def update(self, values: Dict = None, **kwargs):
+        for key, value in dict(values or {}, **kwargs).items():
+            self[key] = value
+
+    def pop(self, key: Text, *default):
+        value = self.source.pop(key, *default)
+        self.dirty.update(self._names_by_key.get(key, ()))
+        return value
+
+    def touch(self, *names: Text):
+        """
+        Mark the named fields as dirty, or all fields if no names are given.
+        """
+        fields = type(self.schema).fields
+        self.dirty.update(names or fields)
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self.dirty)
+
+    def validate(
+        self,
+        strict=False,
+        ignore_required=False,
+        ignore_nullable=False,
+    ):
+        """
+        Process the dirty fields and return the up-to-date results for the
+        record as a whole, just like `Schema.process`. Changing the
+        ignore_required or ignore_nullable flags requires calling `touch`
+        first, as previous results are not re-checked.
+        """
+        schema = self.schema
+        dirty = self.dirty
+
+        if dirty:
+            processor, context, has_before, has_after, _ = schema._prepare(
+                self.context, dirty
+            )
+            if has_before or has_after or schema.allow_additional:
+                data, errors = schema.process(
+                    self.source,
+                    context=self.context,
+                    ignore_required=ignore_required,
+                    ignore_nullable=ignore_nullable,
+                )
+            else:
+                if context is not None:
+                    context.source = self.source
+
+                # clean values are already in dest so that after hooks see
+                # the record as a whole, just as they would otherwise.
+                dest = {k: v for k, v in self.data.items() if k not in dirty}
+                data, errors = processor.process(
+                    self.source,
+                    dest,
+                    context=context,
+                    ignore_required=ignore_required,
+                    ignore_nullable=ignore_nullable,
+                )
+                errors.update(
+                    (k, v) for k, v in self.errors.items() if k not in dirty
+                )
+            self.data = data
+            self.errors = errors
+            dirty.clear()
+
+        if strict:
+            if self.errors:
+                raise ValidationError(schema, self.errors)
+            return dict(self.data)
+
+        return schema.tuple_factory(dict(self.data), dict(self.errors))
@@ -1,19 +1,26 @@
 from appyratus.utils.dict_utils import DictObject
 from uuid import UUID
 from inspect import getmembers
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 from collections import namedtuple, defaultdict
 from copy import deepcopy
+from random import SystemRandom
+from weakref import WeakValueDictionary
 from typing import (
     Callable,
     Dict,
+    Iterable,
+    Iterator,
     List,
     Set,
     Text,
+    Tuple,
     Type,
     Union,
 )
 
+import rapidjson
+
 from faker import Faker
 
 from appyratus.utils.string_utils import StringUtils
@@ -22,6 +29,17 @@ from appyratus.utils.dict_utils import DictObject
 from . import fields
 from .exc import ValidationError
 from .fields import Field, List, Nested
+from .fields.value_generator import GenerationSession
+from .cache import ResultCache
+from .encoder import SchemaEncoder
+from .metrics import SchemaMetrics
+from .processor import SchemaProcessor
+
+# shared by all schemas. being defined at module level, results can be pickled
+ProcessResults = namedtuple('ProcessResults', field_names=['data', 'errors'])
+
+# classes created by Schema.factory, keyed by name and field spec
+_factory_types = WeakValueDictionary()
 
 
 class schema_type(type):
@@ -63,12 +81,114 @@ class schema_type(type):
         # save aggregated fields dict and child
         # schema list set on the new class
         cls.children = []
+
+        # set by instrument. not inherited, as stats are kept per class
+        cls.metrics = None
+
+        # set by factory. subclasses of an interned class are not interned
+        cls.is_interned = False
+
+        for k, field in cls.fields.items():
+            # call any non-null on_create methods. inherited fields were
+            # already created by the base class
+            if field.on_create is not None and k in fields:
+                field.on_create()
+            # accumulate any schema declared in the field
+            child = get_schema_from_field(field)
+            if child is not None:
+                cls.children.append(child)
+            field.attach(cls)
+
+        # index fields by source and by whether they are required, nullable,
+        # etc. processors are compiled lazily on first call to process
+        cls.invalidate_processor()
+
+    def inherit_fields(cls, bases: List):
+        """
+        # Inherit Fields
+        Inherit fields from a base class. Field objects are shared with the
+        base class rather than copied. Modifying one invalidates the processor
+        of each class that shares it, but the change applies to all of them.
+        Use `detach_field` first to modify it for this class only.
+        """
+        for base in bases:
+            if getattr(base, '_is_schema_class', False):
+                cls.fields.update(base.fields)
+
+    def detach_field(cls, name: Text) -> Field:
+        """
+        # Detach Field
+        Replace the named field with a copy owned by this class, returning
+        the copy, so that it can be modified without affecting any base class
+        or subclass that shares it.
+        """
+        if cls.is_interned:
+            raise TypeError(f'cannot detach field {name} of interned {cls.__name__}')
+        field = cls.fields[name]
+        field_copy = deepcopy(field)
+        field.detach(cls)
+        field_copy.attach(cls)
+        cls.fields[name] = field_copy
+        cls.invalidate_processor()
+        return field_copy
+
+    def get_processor(cls, only: Iterable[Text] = None) -> SchemaProcessor:
+        """
+        # Get Processor
+        Return the processor compiled for this Schema class, compiling it first
+        if necessary. If `only` is given, return the processor for just that
+        subset of fields, as returned by `get_projection`.
+        """
+        if only is not None:
+            return cls.get_projection(only)
+
+        processor = cls._processor
+        if processor is None:
+            processor = cls._processor = SchemaProcessor(cls)
+        return processor
+
+    def get_projection(cls, only: Iterable[Text]) -> SchemaProcessor:
+        """
+        # Get Projection
+        Return a processor that only visits, defaults and validates the named
+        fields. Processors for the most recently used subsets are cached on
+        the class. Unknown field names raise a KeyError.
+        """
+        if isinstance(only, SchemaProcessor):
+            return only
+
+        key = only if isinstance(only, frozenset) else frozenset(only)
+        projections = cls._projections
+        processor = projections.pop(key, None)
+        if processor is None:
+            unknown = key - cls.fields.keys()
+            if unknown:
+                raise KeyError(
+                    f'unrecognized fields for {cls.__name__}: '
+                    f'{", ".join(sorted(unknown))}'
+                )
+            processor = SchemaProcessor(
+                cls, fields={k: f for k, f in cls.fields.items() if k in key}
+            )
+            if len(projections) >= cls.max_projections:
+                del projections[next(iter(projections))]
+
+        # reinsert so that the dict is in least to most recently used order
+        projections[key] = processor
+        return processor
+
+    def invalidate_processor(cls):
+        """
+        # Invalidate Processor
+        Discard the compiled processor and re-index the fields. This must be
+        called whenever fields are added to or removed from the class after it
+        is created. Modifying a field calls it automatically.
+        """
         cls.nullable_fields = {}
         cls.required_fields = {}
         cls.optional_fields = {}
         cls.source_2_field = {}
         cls.scalar_fields = {}
-
         for k, field in cls.fields.items():
             cls.source_2_field[field.source] = field
             # track required and optional fields
@@ -80,46 +200,177 @@ class schema_type(type):
                 cls.required_fields[k] = field
             else:
                 cls.optional_fields[k] = field
-            # call any non-null on_create methods
-            if field.on_create is not None:
-                field.on_create()
-            # accumulate any schema declared in the field
-            child = get_schema_from_field(field)
-            if child is not None:
-                cls.children.append(child)
 
-    def inherit_fields(cls, bases: List):
+        cls._processor = None
+        cls._column_processor = None
+        cls._projections = {}
+        cls._encoder = None
+        cls._json_schema = None
+        cls._json_validator = None
+
+    def instrument(cls, metrics: SchemaMetrics = None) -> SchemaMetrics:
         """
-        # Inherit Fields
-        Inherit fields from a base class
+        # Instrument
+        Record the latency and errors of each field of this Schema class, and
+        of the schemas nested in it, in the given or a new `SchemaMetrics`,
+        which is returned.
         """
-        for base in bases:
-            if getattr(base, '_is_schema_class', False):
-                cls.fields.update(deepcopy(base.fields))
+        if metrics is None:
+            metrics = SchemaMetrics()
+        if cls.metrics is not metrics:
+            cls.metrics = metrics
+            cls.invalidate_processor()
+            for child in cls.children:
+                type(child).instrument(metrics)
+        return metrics
+
+    def uninstrument(cls):
+        """
+        # Uninstrument
+        Stop recording metrics for this Schema class and its nested schemas.
+        """
+        if cls.metrics is not None:
+            cls.metrics = None
+            cls.invalidate_processor()
+            for child in cls.children:
+                type(child).uninstrument()
+
+    def get_encoder(cls) -> SchemaEncoder:
+        """
+        # Get Encoder
+        Return the JSON encoder compiled for this Schema class from the types
+        of its fields, compiling it first if necessary.
+        """
+        encoder = cls._encoder
+        if encoder is None:
+            # cache it before compiling, for schemas that nest themselves
+            encoder = cls._encoder = SchemaEncoder(cls)
+            encoder.compile()
+        return encoder
+
+    def get_json_schema(cls) -> Dict:
+        """
+        # Get JSON Schema
+        Return the JSON Schema built for this Schema class from its fields. Use
+        `Schema.to_json_schema` to get a copy that is safe to modify.
+        """
+        json_schema = cls._json_schema
+        if json_schema is None:
+            # placeholder for schemas that nest themselves
+            cls._json_schema = {'type': 'object'}
+            properties = {}
+            required = []
+            for name, field in cls.fields.items():
+                key = field.source or name
+                if field.before is not Field.before:
+                    # the hook could turn anything into a valid value
+                    prop = {}
+                else:
+                    prop = field.to_json_schema()
+                if prop and (field.nullable or field.default is not None):
+                    prop = {'anyOf': [prop, {'type': 'null'}]}
+                if field.required and field.default is None:
+                    required.append(key)
+                properties[key] = prop
+
+            json_schema = {'type': 'object', 'properties': properties}
+            if required:
+                json_schema['required'] = required
+            cls._json_schema = json_schema
+        return json_schema
+
+    def get_json_validator(cls) -> rapidjson.Validator:
+        """
+        # Get JSON Validator
+        Return a rapidjson Validator for this Schema class's JSON Schema.
+        """
+        validator = cls._json_validator
+        if validator is None:
+            validator = cls._json_validator = rapidjson.Validator(
+                rapidjson.dumps(cls.get_json_schema())
+            )
+        return validator
+
+    def get_column_processor(cls) -> 'ColumnProcessor':
+        """
+        # Get Column Processor
+        Return the column processor for this Schema class. This requires NumPy.
+        """
+        processor = cls._column_processor
+        if processor is None:
+            from .columns import ColumnProcessor
+
+            processor = cls._column_processor = ColumnProcessor(cls)
+        return processor
 
 
 class Schema(Field, metaclass=schema_type):
 
     fields = {}
     children = None
+    max_projections = 128
     _is_schema_class = True
 
     @classmethod
-    def factory(cls, name: str, fields: dict) -> Type['Schema']:
+    def factory(cls, name: str, fields: dict, intern=False) -> Type['Schema']:
         """
         Convenience method for building new Schema classes from a dict of Field
         objects, using the given name as the name of the class object.
-        """
-        return type(name, (cls, ), fields)
 
-    def __init__(self, allow_additional=False, **kwargs):
+        With `intern=True`, classes are interned: calling factory again with
+        the same name and identically configured fields returns the existing
+        class, along with the field objects it was first created with. As the
+        class may be shared by unrelated callers, its fields are frozen:
+        modifying, replacing or detaching them raises an error. Subclasses
+        can detach a field to modify their own copy. Note that instrumenting
+        an interned class records the stats of all its callers together.
+        Classes are released once no longer referenced. Nested and List
+        fields intern the schemas they build from a dict of fields.
+        """
+        if not intern:
+            return type(name, (cls, ), fields)
+        try:
+            key = (cls, name) + tuple(
+                (k, v.spec() if isinstance(v, Field) else v)
+                for k, v in sorted(fields.items())
+            )
+            hash(key)
+        except TypeError:
+            # some field has an unhashable attribute
+            return type(name, (cls, ), fields)
+        schema_type = _factory_types.get(key)
+        if schema_type is None:
+            schema_type = type(name, (cls, ), fields)
+            schema_type.is_interned = True
+            for field in schema_type.fields.values():
+                field.freeze()
+            _factory_types[key] = schema_type
+        return schema_type
+
+    def __init__(
+        self,
+        allow_additional=False,
+        cache: Union[ResultCache, bool] = None,
+        **kwargs
+    ):
+        """
+        # Kwargs
+        - `allow_additional`: keep source keys that aren't fields.
+        - `cache`: a `ResultCache` for the results of `process`, or True to
+          create one with default settings. It is only used if the results of
+          all fields can be cached. See `Field.is_cacheable`.
+        """
         super().__init__(**kwargs)
-        self.tuple_factory = namedtuple('results', field_names=['data', 'errors'])
+        self.tuple_factory = ProcessResults
         self.allow_additional = allow_additional
+        if cache is True:
+            cache = ResultCache()
+        self.cache = cache if isinstance(cache, ResultCache) else None
 
     def copy(self):
         schema_copy = super().copy()
         schema_copy.allow_additional = self.allow_additional
+        schema_copy.cache = self.cache
         return schema_copy
 
     def process(
@@ -131,132 +382,383 @@ class Schema(Field, metaclass=schema_type):
         ignore_nullable=False,
         before=None,
         after=None,
+        only: Iterable[Text] = None,
+        fail_fast=False,
+        max_errors: int = None,
     ):
         """
-        Marshal each value in the "source" dict into a new "dest" dict.
+        Marshal each value in the "source" dict into a new "dest" dict. If
+        `only` is given, as a set of field names or a processor returned by
+        `get_projection`, all other fields are skipped as if they did not
+        exist: they are not defaulted, validated or reported as required.
+
+        If `max_errors` is set, processing stops once that many errors have
+        been found, and nested lists and schemas collect no more than that.
+        `fail_fast` is the same as setting max_errors to 1.
         """
-        errors = {}
-
-        context = DictObject(context or {})
-        context.schema = self
-        context.source = source
+        processor, context, has_before, has_after, cache = self._prepare(
+            context, only
+        )
+        return self._process_record(
+            processor,
+            source,
+            context,
+            has_before,
+            has_after,
+            cache,
+            strict,
+            ignore_required,
+            ignore_nullable,
+            1 if fail_fast else max_errors,
+        )
+
+    async def aprocess(
+        self,
+        source: Dict,
+        context: Dict = None,
+        strict=False,
+        ignore_required=False,
+        ignore_nullable=False,
+        only: Iterable[Text] = None,
+        fail_fast=False,
+        max_errors: int = None,
+    ):
+        """
+        # Async Process
+        Like `process`, but any hook, of the schema or of its fields, may be a
+        coroutine function or otherwise return an awaitable. Awaitable field
+        hooks run concurrently, as do fields with their own `aprocess`, like
+        Nested schemas, Lists of them and `BcryptString`. See
+        `SchemaProcessor.aprocess`.
+        """
+        processor, context, has_before, has_after, cache = self._prepare(
+            context, only
+        )
+        if fail_fast:
+            max_errors = 1
+
+        key, results, dest = self._start_record(
+            processor, source, context, cache, ignore_required,
+            ignore_nullable, max_errors,
+        )
+        if results is not None:
+            return self._make_results(*results, strict)
+
+        if has_before:
+            await processor.resolve(self.before(source, context))
+
+        dest, errors = await processor.aprocess(
+            source,
+            dest,
+            context=context,
+            ignore_required=ignore_required,
+            ignore_nullable=ignore_nullable,
+            max_errors=max_errors,
+        )
+
+        if key is not None:
+            cache.set(key, (dest, errors))
+
+        if has_after and not strict:
+            await processor.resolve(self.after(dest, context))
+
+        return self._make_results(dest, errors, strict)
+
+    def process_many(self, records: Iterable[Dict], **kwargs) -> list:
+        """
+        # Process Many
+        Process each record in the given iterable, returning a list of
+        results in the same order. See `iter_process` for kwargs.
+        """
+        return list(self.iter_process(records, **kwargs))
 
-        if self.allow_additional:
-            dest = source.copy()
-        else:
-            dest = {}
+    def iter_process(
+        self,
+        records: Iterable[Dict],
+        context: Dict = None,
+        strict=False,
+        ignore_required=False,
+        ignore_nullable=False,
+        only: Iterable[Text] = None,
+        fail_fast=False,
+        max_errors: int = None,
+    ) -> Iterator:
+        """
+        # Iter Process
+        Lazily process each record in the given iterable, yielding the same
+        thing that `process` would return for each one. The processor, hooks
+        and context are resolved once for the whole batch, so the context
+        object is shared by all records.
+        """
+        processor, context, has_before, has_after, cache = self._prepare(
+            context, only
+        )
+        if fail_fast:
+            max_errors = 1
+        process_record = self._process_record
+        for source in records:
+            yield process_record(
+                processor,
+                source,
+                context,
+                has_before,
+                has_after,
+                cache,
+                strict,
+                ignore_required,
+                ignore_nullable,
+                max_errors,
+            )
 
-        after_fields = []
+    def process_parallel(
+        self,
+        records: Iterable[Dict],
+        workers: int = None,
+        chunk_size: int = 1000,
+        **kwargs
+    ) -> list:
+        """
+        # Process Parallel
+        Process records in chunks across a pool of worker processes, returning
+        a list of results in the same order. To reuse the same pool for many
+        calls, use a `SchemaExecutor` directly.
+        """
+        from .executor import SchemaExecutor
 
-        def generate_default(field):
-            # generate default val from either
-            # the supplied constant or callable.
-            if callable(field.default):
-                source_val = field.default()
-            else:
-                source_val = deepcopy(field.default)
-            return source_val
+        with SchemaExecutor(self, workers=workers, chunk_size=chunk_size) as ex:
+            return ex.process_many(records, **kwargs)
 
-        self.before(source, context)
+    def process_columns(
+        self,
+        data: Union[Dict[Text, Iterable], Iterable[Dict]],
+        ignore_required=False,
+        ignore_nullable=False,
+    ) -> 'ColumnResults':
+        """
+        # Process Columns
+        Process either a sequence of records or a dict of columns, keyed by
+        source key, into a dict of NumPy arrays, keyed by field name and typed
+        by each field's `np_dtype`. Returns `(data, errors, mask)`, where
+        errors maps each invalid row index to its errors and mask maps each
+        field name to a boolean array that is set where there is no value.
+        """
+        return type(self).get_column_processor().process(
+            data,
+            ignore_required=ignore_required,
+            ignore_nullable=ignore_nullable,
+        )
 
-        for field in self.fields.values():
-            # is key simply present in source?
-            field_key = field.source or field.name
-            exists_key = source is not None and field_key in source
+    def to_structured_array(
+        self,
+        data: Union[Dict[Text, Iterable], Iterable[Dict]],
+        ignore_required=False,
+        ignore_nullable=False,
+    ) -> 'ColumnResults':
+        """
+        # To Structured Array
+        Like `process_columns`, but data is returned as a single NumPy
+        structured array with one named column per field.
+        """
+        return type(self).get_column_processor().to_structured_array(
+            data,
+            ignore_required=ignore_required,
+            ignore_nullable=ignore_nullable,
+        )
 
-            # do we ultimately call field.process?
-            skip_field = not exists_key
+    def dump_json(
+        self,
+        data: Union[Dict, Iterable[Dict]],
+        stream=None,
+    ) -> Union[Text, None]:
+        """
+        # Dump JSON
+        Encode a processed record, or an iterable of them as a JSON array,
+        using the encoder compiled for this Schema class. If a stream is given,
+        the JSON is written to it instead of being returned.
+        """
+        encoder = type(self).get_encoder()
+        if isinstance(data, dict):
+            return encoder.encode(data, stream=stream)
+        return encoder.encode_many(data, stream=stream)
 
-            # get source value, None is handled below
-            source_val = source.get(field.source) if isinstance(source, dict) else None
+    def to_json_schema(self) -> Dict:
+        """
+        # To JSON Schema
+        Return a JSON Schema that describes the structure of the JSON objects
+        accepted by this schema: types, required and nullable keys, and the
+        formats of values, like e-mail addresses and UUIDs.
+        """
+        return deepcopy(type(self).get_json_schema())
 
-            # pre-process some fields, first by the schema if provided, then by
-            # the field itself if provided
-            if field.before:
-                source_val, source_err = field.before(
-                    field, source_val, context=context
-                )
-                if source_err:
-                    errors[field.name] = source_err
-
-            if not exists_key:
-                # source key not present but required
-                # try to generate default value if possible
-                # or error.
-                if field.default is not None:
-                    skip_field = False
-                    source_val = generate_default(field)
-                elif field.required and not ignore_required:
-                    errors[field.name] = f'{field.name} is required'
-                    continue
-                else:
-                    continue
-
-            if (source_val is None):
-                if field.default is not None:
-                    # field has a default specified, attempt to generate
-                    # the default from it
-                    skip_field = False
-                    source_val = generate_default(field)
-                if not field.nullable:
-                    # field cannot be null
-                    if source_val is not None:
-                        # source val is now populated with a default, set it
-                        dest[field.name] = source_val
-                    elif not ignore_nullable:
-                        # but None not allowed!
-                        errors[field.name] = f'{field.name} not nullable'
-                    continue
-                else:
-                    # when it is nullable then set to None
-                    dest[field.name] = None
-                    continue
-
-            if skip_field:
-                # the key isn't in source, but that's ok,
-                # as this means that the field isn't required
-                # and has no default value.
-                continue
+    def validate_json_bytes(self, raw: Union[bytes, Text]) -> Dict:
+        """
+        # Validate JSON Bytes
+        Validate a raw JSON document against this schema's JSON Schema, in C,
+        without decoding it into Python objects. Returns a dict with the first
+        error, keyed by the JSON pointer of the invalid value, or an empty dict
+        if the document is valid.
+        """
+        try:
+            type(self).get_json_validator()(raw)
+        except rapidjson.ValidationError as exc:
+            kind, schema_pointer, doc_pointer = exc.args
+            return {doc_pointer: kind}
+        except rapidjson.JSONDecodeError:
+            return {'#': 'invalid JSON'}
+        return {}
+
+    def process_json(
+        self,
+        raw: Union[bytes, Text],
+        validate=True,
+        strict=False,
+        **kwargs
+    ):
+        """
+        # Process JSON
+        Decode and process a raw JSON document. If validate is set, the
+        document is checked with `validate_json_bytes` first, and returned
+        errors are those of the validator, if it fails.
+        """
+        errors = self.validate_json_bytes(raw) if validate else None
+        if not errors:
+            try:
+                source = rapidjson.loads(raw)
+            except rapidjson.JSONDecodeError:
+                errors = {'#': 'invalid JSON'}
+            else:
+                return self.process(source, strict=strict, **kwargs)
 
-            # apply field to the source value
-            dest_val, field_err = field.process(source_val)
+        if strict:
+            raise ValidationError(self, errors)
+        return self.tuple_factory({}, errors)
 
-            if not field_err:
-                dest[field.name] = dest_val
-            else:
-                errors[field.name] = field_err
+    def compile_dumper(self) -> Callable:
+        encoder = type(self).get_encoder()
+        return encoder.dump if encoder.needs_dump else None
 
-            if field.after is not None:
-                after_fields.append(field)
+    def is_cacheable(self) -> bool:
+        return (
+            type(self).get_processor().cacheable and
+            getattr(self.before, '__func__', None) is Schema.before and
+            getattr(self.after, '__func__', None) is Schema.after
+        )
 
-        # call all post-process callbacks
-        for field in after_fields:
-            dest_val = dest.pop(field.name, None)
-            field_val, field_err = field.after(
-                field, dest_val, dest, context=context
+    def _prepare(self, context: Dict = None, only: Iterable[Text] = None) -> Tuple:
+        """
+        Resolve everything needed by `_process_record` that does not depend
+        on the record itself.
+        """
+        processor = type(self).get_processor(only)
+        has_before = getattr(self.before, '__func__', None) is not Schema.before
+        has_after = getattr(self.after, '__func__', None) is not Schema.after
+
+        # only build a context if something is going to receive it
+        if (
+            context is not None or has_before or has_after or
+            processor.needs_context
+        ):
+            context = DictObject(context or {})
+            context.schema = self
+
+        # projections aren't cached, so as not to share entries with the
+        # results of processing all fields.
+        cache = self.cache
+        if cache is not None and (
+            has_before or has_after or only is not None or
+            not processor.cacheable
+        ):
+            cache = None
+
+        return (processor, context, has_before, has_after, cache)
+
+    def _process_record(
+        self,
+        processor: SchemaProcessor,
+        source: Dict,
+        context: DictObject,
+        has_before: bool,
+        has_after: bool,
+        cache: ResultCache,
+        strict: bool,
+        ignore_required: bool,
+        ignore_nullable: bool,
+        max_errors: int,
+    ):
+        key, results, dest = self._start_record(
+            processor, source, context, cache, ignore_required,
+            ignore_nullable, max_errors,
+        )
+        if results is not None:
+            return self._make_results(*results, strict)
+
+        if has_before:
+            self.before(source, context)
+
+        dest, errors = processor.process(
+            source,
+            dest,
+            context=context,
+            ignore_required=ignore_required,
+            ignore_nullable=ignore_nullable,
+            max_errors=max_errors,
+        )
+
+        if key is not None:
+            cache.set(key, (dest, errors))
+
+        if has_after and not strict:
+            self.after(dest, context)
+
+        return self._make_results(dest, errors, strict)
+
+    def _start_record(
+        self,
+        processor: SchemaProcessor,
+        source: Dict,
+        context: DictObject,
+        cache: ResultCache,
+        ignore_required: bool,
+        ignore_nullable: bool,
+        max_errors: int,
+    ) -> Tuple:
+        """
+        Do what `_process_record` and `aprocess` do before processing a record.
+        Returns its cache key, if any, the cached `(dest, errors)` results, if
+        any, and the dest dict to process it into otherwise.
+        """
+        key = None
+        if cache is not None:
+            # the processor is part of the key, so that a cache may be shared
+            # by schemas of different classes, and entries from before it was
+            # recompiled are never hit.
+            key = cache.make_key(
+                source, processor, self.allow_additional, ignore_required,
+                ignore_nullable, max_errors,
             )
-            # now recheck nullity of the post-processed field value
-            if (
-                (dest_val is None) and
-                (not field.nullable and not ignore_nullable)
-            ):
-                errors[field.name] = f'{field.name} not nullable'
-            elif not field_err:
-                dest[field.name] = field_val
-            else:
-                errors[field.name] = field_err
+            if key is not None:
+                results = cache.get(key)
+                if results is not None:
+                    return (key, results, None)
+
+        if self.allow_additional:
+            dest = source.copy()
+        else:
+            dest = {}
+
+        if context is not None:
+            context.source = source
+
+        return (key, None, dest)
 
+    def _make_results(self, dest: Dict, errors: Dict, strict: bool):
         # "strict" means we raise an exception
         # or return just the processed dict
         if strict:
             if errors:
                 raise ValidationError(self, errors)
-            else:
-                return dest
-
-        self.after(dest, context)
-        results = self.tuple_factory(dest, errors)
-        return results
+            return dest
+        return self.tuple_factory(dest, errors)
 
     def before(self, source: Dict, context):
         pass
@@ -284,6 +786,8 @@ class Schema(Field, metaclass=schema_type):
     @classmethod
     def replace_field(cls, new_field: Field, overwrite=True):
         name = new_field.name
+        if cls.is_interned:
+            raise TypeError(f'cannot replace field {name} of interned {cls.__name__}')
         cls.fields[name] = new_field
         old_field = cls.fields.get(name)
 
@@ -317,12 +821,75 @@ class Schema(Field, metaclass=schema_type):
         else:
             cls.optional_fields[name] = new_field
 
+        new_field.attach(cls)
+        cls.invalidate_processor()
+
     def on_generate(self, fields: Set[Text] = None, **kwargs) -> Dict:
         return {
             k: self.fields[k].generate()
             for k in (fields or self.fields)
         }
 
+    def generate_many(
+        self,
+        n: int,
+        fields: Set[Text] = None,
+        seed=None,
+        workers: int = None,
+        chunk_size: int = 1000,
+    ) -> list:
+        """
+        # Generate Many
+        Generate n records, resolving the generator callback for each field
+        only once. If a seed is given, each record is generated by a session
+        seeded from the seed and the record's index, so the output for a given
+        seed is always the same, regardless of the number of workers.
+        """
+        if workers is not None and workers > 1:
+            from .executor import SchemaExecutor
+
+            now = None
+            if seed is None:
+                # otherwise, forked workers would share the same random state.
+                # dates are still relative to the current time, as they would
+                # be without a seed, rather than to SEEDED_NOW
+                seed = SystemRandom().getrandbits(64)
+                now = datetime.now(timezone.utc)
+            with SchemaExecutor(self, workers=workers, chunk_size=chunk_size) as ex:
+                return ex.generate_many(n, fields=fields, seed=seed, now=now)
+
+        return self.generate_range(0, n, fields=fields, seed=seed)
+
+    def generate_range(
+        self,
+        start: int,
+        stop: int,
+        fields: Set[Text] = None,
+        seed=None,
+        now: datetime = None,
+    ) -> list:
+        """
+        # Generate Range
+        Generate the records at indexes start through stop - 1 of the sequence
+        that `generate_many` would generate for the same seed. With a seed,
+        generated dates are relative to `now`, if given, as in
+        `GenerationSession`.
+        """
+        funcs = [
+            (k, field.generator.resolve(field))
+            for k, field in ((k, self.fields[k]) for k in (fields or self.fields))
+        ]
+
+        if seed is None:
+            return [{k: func() for k, func in funcs} for _ in range(start, stop)]
+
+        records = []
+        with GenerationSession(seed, now=now) as session:
+            for idx in range(start, stop):
+                session.reseed(f'{seed}:{idx}')
+                records.append({k: func() for k, func in funcs})
+        return records
+
     @classmethod
     def infer(
         cls,
@@ -35,7 +35,7 @@ class FileTypeTests(BaseTests):
             TestJsonFileType.parameterize(metafunc)
         ```
         """
-        spec = inspect.getargspec(metafunc.function)
+        spec = inspect.getfullargspec(metafunc.function)
 
         def apply_arg(sample_type, sample_path_arg):
             idlist = []
@@ -1,3 +1,6 @@
+import re
+
+from functools import lru_cache
 from typing import Callable, Tuple, List, Union, Optional, Text
 from datetime import datetime, timedelta, date
 
@@ -5,6 +8,42 @@ import pytz
 
 from dateutil.parser import parse
 
+# the subset of ISO-8601/RFC-3339 that datetime.fromisoformat parses the same
+# way as dateutil on all supported python versions
+RE_ISO_8601 = re.compile(
+    r'^\d{4}-\d{2}-\d{2}'
+    r'([T ]\d{2}:\d{2}(:\d{2}(\.\d{3}(\d{3})?)?)?)?'
+    r'([+-]\d{2}:\d{2}|Z)?$'
+)
+
+
+@lru_cache(maxsize=None)
+def _get_offset_tzinfo(offset: Text):
+    # the tzinfo that dateutil returns for a UTC offset, like "Z" or "+05:30".
+    # this is tzutc, tzlocal or tzoffset, depending on the offset and local
+    # time zone, rather than the datetime.timezone that fromisoformat returns
+    return parse(f'2000-01-01T00:00:00{offset}').tzinfo
+
+
+def _parse_datetime_string(text: Text) -> datetime:
+    if RE_ISO_8601.match(text):
+        try:
+            if text[-1] == 'Z':
+                dt = datetime.fromisoformat(text[:-1] + '+00:00')
+                return dt.replace(tzinfo=_get_offset_tzinfo('Z'))
+            dt = datetime.fromisoformat(text)
+        except ValueError:
+            pass
+        else:
+            if dt.tzinfo is not None:
+                dt = dt.replace(tzinfo=_get_offset_tzinfo(text[-6:]))
+            return dt
+    return parse(text)
+
+
+_parse_datetime_string_cached = lru_cache(maxsize=4096)(_parse_datetime_string)
+
+
 class TimeUtils(object):
 
     @classmethod
@@ -54,7 +93,7 @@ class TimeUtils(object):
         if isinstance(obj, datetime):
             dt = obj
         elif isinstance(obj, str):
-            dt = parse(obj)
+            dt = cls.parse_datetime_string(obj)
         elif isinstance(obj, (int, float)):
             dt = cls.from_timestamp(obj)
         else:
@@ -63,6 +102,19 @@ class TimeUtils(object):
         # set the timezone on the new datetime
         return dt.replace(tzinfo=timezone)
 
+    @staticmethod
+    def parse_datetime_string(text: Text, cache: bool = False) -> datetime:
+        """
+        Parse a datetime string. Common ISO-8601 formats are parsed by
+        `datetime.fromisoformat`, falling back to the much slower but more
+        lenient dateutil parser for anything else. With `cache`, results are
+        kept in an LRU cache, which helps when the same values repeat. Raises
+        ValueError or OverflowError if the string can't be parsed.
+        """
+        if cache:
+            return _parse_datetime_string_cached(text)
+        return _parse_datetime_string(text)
+
     @classmethod
     def from_timestamp(cls, timestamp: int, timezone=pytz.utc) -> datetime:
         """
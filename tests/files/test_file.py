@@ -0,0 +1,47 @@
+import codecs
+
+from appyratus.files import File
+from appyratus.test import mark, BaseTests
+
+
+@mark.unit
+class TestFile(BaseTests):
+
+    @property
+    def klass(self):
+        return File
+
+    @mark.params(
+        'raw, text, encoding',
+        [
+            ('bajor\r\ncardassia'.encode(), 'bajor\ncardassia', 'utf-8'),
+            (codecs.BOM_UTF8 + 'bajor'.encode(), 'bajor', 'utf-8-sig'),
+            ('bajor'.encode('utf-16'), 'bajor', 'utf-16'),
+            ('bajor'.encode('utf-32'), 'bajor', 'utf-32'),
+            ('qo\'noS é'.encode('latin-1'), 'qo\'noS é', 'latin'),
+        ]
+    )
+    def test_read(self, tmp_path, raw, text, encoding):
+        path = tmp_path / 'planet.txt'
+        path.write_bytes(raw)
+        assert self.klass.read(str(path)) == text
+        assert self.klass.get_encoding(str(path)) == encoding
+        assert self.klass.read(str(path), mode='rb') == raw
+
+    def test_read_rewritten_file(self, tmp_path):
+        path = tmp_path / 'planet.txt'
+        path.write_bytes('qo\'noS é'.encode('latin-1'))
+        assert self.klass.read(str(path)) == 'qo\'noS é'
+        path.write_bytes('café ☃'.encode())
+        assert self.klass.read(str(path)) == 'café ☃'
+        assert self.klass.get_encoding(str(path)) == 'utf-8'
+
+    def test_encodings_are_bounded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(self.klass, 'max_encodings', 2)
+        paths = [tmp_path / f'{name}.txt' for name in ('bajor', 'vulcan', 'risa')]
+        for path in paths:
+            path.write_bytes(b'planet')
+            self.klass.read(str(path))
+        assert self.klass.get_encoding(str(paths[0])) is None
+        assert self.klass.get_encoding(str(paths[-1])) == 'utf-8'
+        assert len(File._encodings) <= 2
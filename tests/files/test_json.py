@@ -1,3 +1,5 @@
+import pytest
+
 from appyratus.files import Json
 from appyratus.test import (
     FileTypeTests,
@@ -14,3 +16,31 @@ class TestJsonFileType(FileTypeTests):
     @classmethod
     def __klass__(cls):
         return Json
+
+    def test_dump(self):
+        data = {'b': [1, 2], 'a': None}
+        assert self.klass.dump(data) == '{\n  "a": null,\n  "b": [\n    1,\n    2\n  ]\n}'
+        assert self.klass.dump(data, prettify=False) == '{"a":null,"b":[1,2]}'
+        assert self.klass.load(self.klass.dump(data, beautify=True)) == data
+
+    def test_iter_items(self):
+        import io
+
+        data = [1, 'a, "b"]', {'c': [{'d': [[[[[[[None]]]]]]]}]}, [], {}]
+        raw = self.klass.dump(data).encode()
+        for chunk_size in (1, 7, 1 << 20):
+            items = self.klass.iter_items(io.BytesIO(raw), chunk_size=chunk_size)
+            assert list(items) == data
+        assert list(self.klass.iter_items(io.StringIO('[]'))) == []
+        assert list(self.klass.iter_items(io.StringIO('\ufeff [1]'))) == [1]
+
+        # items that span many chunks, ending mid-string and mid-escape
+        data = ['a\\"' * 1000, {'b': ['c"\\' * 1000] * 3}, 'd']
+        raw = self.klass.dump(data, prettify=False).encode()
+        for chunk_size in (1, 2, 3, 1000):
+            items = self.klass.iter_items(io.BytesIO(raw), chunk_size=chunk_size)
+            assert list(items) == data
+
+        for raw in (b'"a" [1]', b'{"a": [1]}', b'1, [2]', b'[1, 2'):
+            with pytest.raises(ValueError):
+                list(self.klass.iter_items(io.BytesIO(raw), chunk_size=2))
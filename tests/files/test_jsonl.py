@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from appyratus.files import JsonLines
+from appyratus.schema import Schema, ValidationError, fields
+from appyratus.test import mark, BaseTests
+
+
+class LogEntrySchema(Schema):
+    officer = fields.String(required=True)
+    stardate = fields.DateTime()
+
+
+@mark.unit
+class TestJsonLinesFileType(BaseTests):
+
+    @property
+    def klass(self):
+        return JsonLines
+
+    def test_write_many_and_iter_read(self, tmp_path):
+        path = str(tmp_path / 'log.jsonl')
+        entries = [{'officer': f'crewman {i}', 'deck': i} for i in range(100)]
+
+        assert self.klass.write_many(path, entries[:10], append=False) == 10
+        assert self.klass.write_many(path, iter(entries[10:]), buffer_size=64) == 90
+        assert list(self.klass.iter_read(path)) == entries
+        assert self.klass.read(path) == entries
+
+        self.klass.write(path, entries[:2])
+        assert self.klass.read(path) == entries[:2]
+
+    def test_schema(self, tmp_path):
+        path = str(tmp_path / 'log.jsonl')
+        stardate = datetime(2371, 5, 1, tzinfo=timezone.utc)
+        schema = LogEntrySchema()
+        self.klass.write_many(
+            path, [{'officer': 'kira', 'stardate': stardate}, {}], schema=schema
+        )
+
+        records = self.klass.iter_read(path, schema=schema)
+        assert next(records) == {'officer': 'kira', 'stardate': stardate}
+        with pytest.raises(ValidationError):
+            next(records)
+
+        results = list(self.klass.iter_read(path, schema=schema, strict=False))
+        assert results[1].errors == {'officer': 'officer is required'}
+
+    def test_invalid_line(self, tmp_path):
+        path = tmp_path / 'log.jsonl'
+        path.write_text('{"officer": "odo"}\n\n{"officer":\n')
+        with pytest.raises(ValueError, match=':3:'):
+            list(self.klass.iter_read(str(path)))
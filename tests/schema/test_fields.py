@@ -1,12 +1,17 @@
+import array
+import asyncio
+
+from datetime import datetime, timezone
 from uuid import UUID
 
+import pytest
+
 from appyratus.test import mark, BaseTests
 from appyratus.schema import Schema
 from appyratus.schema.fields import fields
-from appyratus.utils import TimeUtils
+from appyratus.utils.time_utils import TimeUtils
 
 # TODO
-# Bytes
 # FormatString
 # Uint32
 # Uint64
@@ -105,6 +110,26 @@ class TestStringField(BaseTests):
         assert res == result
         assert err == error
 
+    def test_compact_layout(self):
+        import copy
+        import pickle
+
+        def before(field, value, context=None):
+            return (value, None)
+
+        field = self.klass(name='ship')
+        assert field.before is fields.Field.before
+        assert not vars(field)
+        assert field.meta == {}
+
+        field = self.klass(name='ship', before=before, rank='captain')
+        assert field.before is before
+        assert field.meta == {'rank': 'captain'}
+        pickled = pickle.dumps(self.klass(name='ship'))
+        for field_copy in (copy.deepcopy(field), pickle.loads(pickled)):
+            assert field_copy.name == 'ship'
+            assert field_copy.process('defiant') == ('defiant', None)
+
 
 @mark.unit
 class TestIntField(BaseTests):
@@ -333,6 +358,50 @@ class TestBoolField(BaseTests):
         assert err == error
 
 
+@mark.unit
+class TestBytesField(BaseTests):
+
+    @property
+    def klass(self):
+        return fields.Bytes
+
+    @mark.params(
+        'value, kwargs, result, error',
+        [
+    # Bytes and encoded strings
+            (b'quark', {}, b'quark', None),
+            ('quark', {}, b'quark', None),
+    # Buffer-protocol objects
+            (bytearray(b'quark'), {}, b'quark', None),
+            (memoryview(b'quark'), {}, b'quark', None),
+            (memoryview(b'quark')[::2], {}, b'qak', None),
+            (array.array('B', b'quark'), {}, b'quark', None),
+    # Max length
+            (b'quark', {'max_length': 5}, b'quark', None),
+            (bytearray(b'quark'), {'max_length': 4}, None, fields.INVALID_VALUE),
+    # Unrecognized types
+            (1, {}, None, fields.UNRECOGNIZED_VALUE),
+            ([], {}, None, fields.UNRECOGNIZED_VALUE),
+        ]
+    )
+    def test_process(self, value, kwargs, result, error):
+        res, err = self.klass(**kwargs).process(value)
+        assert res == result
+        assert err == error
+
+    def test_as_memoryview(self):
+        buffer = bytearray(b'quark')
+        view, err = self.klass(as_memoryview=True).process(buffer)
+        assert err is None
+        assert isinstance(view, memoryview)
+        # values are not copied
+        buffer[0:1] = b'Q'
+        assert view.tobytes() == b'Quark'
+
+        view, err = self.klass(as_memoryview=True).process(array.array('H', [1]))
+        assert (view.format, view.nbytes) == ('B', 2)
+
+
 @mark.unit
 class TestDateTimeField(BaseTests):
     """
@@ -502,6 +571,41 @@ class TestListField(BaseTests):
         )
         assert res.data['rules'][0] != {}
 
+    @mark.params(
+        'nested, value',
+        [
+            (fields.Int(), [1, '2', 3]),
+            (fields.Int(), [1, 'x', 3, None]),
+            (fields.Float(), ['1.5', 2, 3.0]),
+            (fields.Bool(), [True, 'f', 1, 'maybe']),
+            (fields.Int(), list(range(1000))),
+            (fields.Int(), [1, 2 ** 64, str(2 ** 64), 2]),
+            (fields.Timestamp(), [1.5, datetime(2020, 1, 1, tzinfo=timezone.utc), 2]),
+        ]
+    )
+    @mark.params('array_type', ['numpy', 'array'])
+    def test_array_type(self, nested, value, array_type):
+        pytest.importorskip('numpy')
+
+        expected, expected_error = self.klass(nested).process(value)
+        res, err = self.klass(nested, array_type=array_type).process(value)
+        if value[1] == 2 ** 64:
+            # out of the range of int64
+            expected, expected_error = None, {1: 'invalid', 2: 'invalid'}
+        assert err == expected_error
+        if expected is None:
+            assert res is None
+        else:
+            assert res.tolist() == expected
+            if array_type == 'array':
+                assert isinstance(res, array.array)
+
+    def test_array_type_max_errors(self):
+        pytest.importorskip('numpy')
+
+        field = self.klass(fields.Int(), array_type='numpy')
+        assert field.process(['x'] * 1000, max_errors=2) == (None, {0: 'invalid', 1: 'invalid'})
+
 
 @mark.unit
 class TestNestedField(BaseTests):
@@ -520,3 +624,64 @@ class TestNestedField(BaseTests):
 
         res = NestedFieldsSchema().process({'stuff': {'string': 'klingon', 'int': 1337}})
         print(res)
+
+
+@mark.unit
+class TestBcryptStringField(BaseTests):
+
+    @property
+    def klass(self):
+        return fields.BcryptString
+
+    def test_process(self):
+        hashed, err = self.klass(rounds=4).process('latinum')
+        assert err is None
+        assert hashed == 'latinum'
+        # existing hashes are not hashed again
+        rehashed, err = self.klass().process(hashed)
+        assert str.__eq__(rehashed, hashed)
+
+    def test_aprocess(self):
+        async def process_and_verify():
+            hashed, err = await self.klass(rounds=4).aprocess('latinum')
+            assert err is None
+            assert await hashed.averify('latinum')
+            assert not await hashed.averify('gold-pressed')
+
+        asyncio.run(process_and_verify())
+
+
+@mark.unit
+class TestEmailField(BaseTests):
+
+    @property
+    def klass(self):
+        return fields.Email
+
+    @mark.params(
+        'value, is_valid',
+        [
+            ('Kira@DS9.org', True),
+            ('kíra@bajor.bj', True),
+            ('kira@ds9.org\n', False),
+            ('kira', False),
+            ('a@☃.☃', False),
+            ('ki\u00a0ra@ds9.org', False),
+            ('ki\u200bra@ds9.org', False),
+            ('ki\u2028ra@ds9.org', False),
+            ('ki\u3000ra@ds9.org', False),
+        ]
+    )
+    def test_process(self, value, is_valid):
+        import rapidjson
+
+        res, err = self.klass().process(value)
+        assert (err is None) == is_valid
+        validator = rapidjson.Validator(rapidjson.dumps(self.klass().to_json_schema()))
+        if is_valid:
+            assert res == value.lower()
+            validator(rapidjson.dumps(value))
+        elif value != 'a@☃.☃':
+            # the JSON Schema also allows some symbols that process doesn't
+            with pytest.raises(rapidjson.ValidationError):
+                validator(rapidjson.dumps(value))
@@ -0,0 +1,882 @@
+import asyncio
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from enum import IntEnum
+from uuid import uuid4
+
+import pytest
+
+from appyratus.test import mark, BaseTests
+from appyratus.schema import (
+    ResultCache,
+    Schema,
+    SchemaExecutor,
+    SchemaMetrics,
+    SchemaRecord,
+    ValidationError,
+)
+from appyratus.schema.fields import fields
+
+
+class CrewSchema(Schema):
+    name = fields.String(required=True)
+    rank = fields.String(default='ensign')
+    age = fields.Int(source='age_int')
+    species = fields.String(nullable=True)
+    crew = fields.List(fields.String(), default=list)
+
+
+@mark.unit
+class TestSchemaProcess(BaseTests):
+
+    @property
+    def klass(self):
+        return CrewSchema
+
+    @mark.params(
+        'source, kwargs, data, errors',
+        [
+    # Defaults are applied to missing keys
+            (
+                {'name': 'worf', 'age_int': '30'}, {},
+                {'name': 'worf', 'rank': 'ensign', 'age': 30, 'crew': []}, {}
+            ),
+    # Missing required fields are reported
+            ({}, {}, {'rank': 'ensign', 'crew': []}, {'name': 'name is required'}),
+            ({}, {'ignore_required': True}, {'rank': 'ensign', 'crew': []}, {}),
+    # Nullable fields accept None
+            (
+                {'name': 'odo', 'species': None}, {},
+                {'name': 'odo', 'species': None, 'rank': 'ensign', 'crew': []}, {}
+            ),
+    # Non-nullable fields report None
+            (
+                {'name': None}, {},
+                {'rank': 'ensign', 'crew': []}, {'name': 'name not nullable'}
+            ),
+        ]
+    )
+    def test_process(self, source, kwargs, data, errors):
+        res = self.klass().process(source, **kwargs)
+        assert res.data == data
+        assert res.errors == errors
+
+    def test_fail_fast(self):
+        source = {'age_int': 'x', 'crew': [1, 2]}
+        res = self.klass().process(source, fail_fast=True)
+        assert res.errors == {'name': 'name is required'}
+        with pytest.raises(ValidationError):
+            self.klass().process(source, fail_fast=True, strict=True)
+
+    def test_max_errors(self):
+        class ManifestSchema(Schema):
+            name = fields.String(required=True)
+            crew = fields.List(fields.Int(), nullable=True)
+            ship = fields.Nested(
+                {'registry': fields.Int(), 'crew': fields.Int()}, nullable=True
+            )
+
+        schema = ManifestSchema()
+        source = {
+            'crew': ['x'] * 1000,
+            'ship': {'registry': 'x', 'crew': 'x'},
+        }
+        assert len(schema.process(source).errors['crew']) == 1000
+
+        # nested fields get whatever is left of the budget
+        errors = schema.process(source, max_errors=2).errors
+        assert errors == {'name': 'name is required', 'crew': {0: 'invalid'}}
+
+        errors = schema.process(source, max_errors=3).errors
+        assert errors == {
+            'name': 'name is required',
+            'crew': {0: 'invalid', 1: 'invalid'},
+            'ship': {'registry': 'invalid'},
+        }
+
+    def test_max_errors_with_overridden_process(self):
+        class Roster(fields.List):
+            def process(self, value):
+                return super().process(value)
+
+        class RosterSchema(Schema):
+            name = fields.String(required=True)
+            crew = Roster(fields.Int(), nullable=True)
+
+        schema = RosterSchema()
+        source = {'crew': ['1', 'x', 'y']}
+        expected = {
+            'name': 'name is required',
+            'crew': {1: 'invalid', 2: 'invalid'},
+        }
+        assert schema.process(source, max_errors=5).errors == expected
+        res = asyncio.run(schema.aprocess(source, max_errors=5))
+        assert res.errors == expected
+
+    def test_processor_is_compiled_once(self):
+        processor = self.klass.get_processor()
+        self.klass().process({'name': 'worf'})
+        assert self.klass.get_processor() is processor
+        self.klass.invalidate_processor()
+        assert self.klass.get_processor() is not processor
+
+    def test_processor_is_not_inherited(self):
+        class SubCrewSchema(CrewSchema):
+            ship = fields.String()
+
+        res = SubCrewSchema().process({'name': 'sisko', 'ship': 'defiant'})
+        assert res.data['ship'] == 'defiant'
+        assert 'ship' not in CrewSchema().process({'ship': 'defiant'}).data
+
+    def test_inherited_fields_are_shared(self):
+        class BaseCrewSchema(Schema):
+            name = fields.String()
+            rank = fields.String(default='ensign')
+
+        class SubCrewSchema(BaseCrewSchema):
+            ship = fields.String()
+
+        class OtherCrewSchema(BaseCrewSchema):
+            pass
+
+        def get_rank(schema_type):
+            return schema_type().process({'name': 'data'}).data.get('rank')
+
+        rank = SubCrewSchema.fields['rank']
+        assert rank is BaseCrewSchema.fields['rank']
+        assert get_rank(SubCrewSchema) == 'ensign'
+        assert get_rank(BaseCrewSchema) == 'ensign'
+        assert get_rank(OtherCrewSchema) == 'ensign'
+
+        # modifying a shared field recompiles every class that uses it
+        rank.default = 'lieutenant'
+        rank.required = True
+        for schema_type in (BaseCrewSchema, SubCrewSchema, OtherCrewSchema):
+            assert get_rank(schema_type) == 'lieutenant'
+            assert 'rank' in schema_type.required_fields
+            assert 'rank' not in schema_type.optional_fields
+
+        # a detached field is owned by the class alone
+        rank = SubCrewSchema.detach_field('rank')
+        assert SubCrewSchema.fields['rank'] is rank
+        assert SubCrewSchema.required_fields['rank'] is rank
+        rank.default = 'commander'
+        assert get_rank(SubCrewSchema) == 'commander'
+        assert get_rank(BaseCrewSchema) == 'lieutenant'
+        assert get_rank(OtherCrewSchema) == 'lieutenant'
+
+        BaseCrewSchema.fields['rank'].default = 'ensign'
+        assert get_rank(SubCrewSchema) == 'commander'
+        assert get_rank(OtherCrewSchema) == 'ensign'
+
+    def test_factory_interns_classes(self):
+        def make(name='Tenant', **kwargs):
+            return Schema.factory(name, dict({
+                'name': fields.String(required=True),
+                'tags': fields.List(fields.String()),
+                'address': fields.Nested({'zip': fields.Int()}),
+            }, **kwargs), intern=True)
+
+        tenant_type = make()
+        assert make() is tenant_type
+        assert make('Other') is not tenant_type
+        assert make(name_2=fields.String()) is not tenant_type
+        assert make(tags=fields.List(fields.Int())) is not tenant_type
+        assert make(address=fields.Nested({'zip': fields.String()})) is not tenant_type
+        assert Schema.factory('Tenant', make().fields) is not tenant_type
+        assert (
+            fields.Nested({'zip': fields.Int()}).schema_type is
+            tenant_type.fields['address'].schema_type
+        )
+        res = make()().process({'name': 'x', 'tags': ['a'], 'address': {'zip': '1'}})
+        assert res.data == {'name': 'x', 'tags': ['a'], 'address': {'zip': 1}}
+
+    def test_interned_classes_are_frozen(self):
+        def make():
+            return Schema.factory('Tenant', {
+                'rank': fields.String(default='ensign'),
+                'tags': fields.List(fields.String()),
+            }, intern=True)
+
+        tenant_type = make()
+        other_type = make()
+        assert other_type is tenant_type and tenant_type.is_interned
+
+        with pytest.raises(AttributeError):
+            other_type.fields['rank'].default = 'captain'
+        with pytest.raises(AttributeError):
+            other_type.fields['tags'].nested.default = 'x'
+        with pytest.raises(TypeError):
+            other_type.detach_field('rank')
+        with pytest.raises(TypeError):
+            other_type.replace_field(fields.String(name='rank'))
+        assert tenant_type().process({}).data == {'rank': 'ensign'}
+        assert make()().process({}).data == {'rank': 'ensign'}
+
+        # a subclass can modify its own copy of a field
+        class SubTenantSchema(other_type):
+            pass
+
+        assert not SubTenantSchema.is_interned
+        rank = SubTenantSchema.detach_field('rank')
+        rank.default = 'captain'
+        assert SubTenantSchema().process({}).data == {'rank': 'captain'}
+        assert make()().process({}).data == {'rank': 'ensign'}
+
+    def test_list_on_create(self):
+        calls = []
+        field = fields.List(fields.String(), on_create=lambda: calls.append(1))
+        Schema.factory('Tags', {'tags': field})
+        assert calls == [1]
+        assert field.nested.name == 'tag'
+
+    def test_hooks(self):
+        def before(field, value, context=None):
+            return (value.strip(), None)
+
+        def after(field, value, data, context=None):
+            return (f'{value}!', None)
+
+        class HookSchema(Schema):
+            name = fields.String(before=before, after=after)
+
+        res = HookSchema().process({'name': ' kira '})
+        assert res.data == {'name': 'kira!'}
+        assert res.errors == {}
+
+    @mark.params(
+        'source, only, data, errors',
+        [
+    # Other fields are neither defaulted nor reported as required
+            ({'age_int': '30'}, {'age'}, {'age': 30}, {}),
+            ({'age_int': 'x', 'name': 1}, {'age'}, {}, {'age': 'age not nullable'}),
+            ({}, {'name', 'rank'}, {'rank': 'ensign'}, {'name': 'name is required'}),
+        ]
+    )
+    def test_process_only(self, source, only, data, errors):
+        res = self.klass().process(source, only=only)
+        assert res.data == data
+        assert res.errors == errors
+
+    def test_projection_is_cached(self):
+        projection = self.klass.get_projection(['age', 'name'])
+        assert self.klass.get_projection({'name', 'age'}) is projection
+        assert self.klass.get_projection(projection) is projection
+        assert self.klass().process({'age_int': 1}, only=projection).data == {'age': 1}
+        self.klass.invalidate_processor()
+        assert self.klass.get_projection({'name', 'age'}) is not projection
+
+    def test_projection_of_unknown_field(self):
+        with pytest.raises(KeyError):
+            self.klass.get_projection({'name', 'ship'})
+
+
+@mark.unit
+class TestSchemaProcessMany(BaseTests):
+
+    @property
+    def klass(self):
+        return CrewSchema
+
+    def test_process_many(self):
+        records = [{'name': 'worf'}, {}, {'name': 'dax', 'age_int': 'x'}]
+        schema = self.klass()
+        results = schema.process_many(records)
+        assert results == [schema.process(r) for r in records]
+
+    def test_iter_process_is_lazy(self):
+        def records():
+            yield {'name': 'quark'}
+            raise AssertionError('records consumed eagerly')
+
+        results = self.klass().iter_process(records())
+        assert next(results).data['name'] == 'quark'
+
+    def test_results_are_picklable(self):
+        import pickle
+
+        results = self.klass().process({'name': 'rom'})
+        assert pickle.loads(pickle.dumps(results)) == results
+
+
+@mark.unit
+class TestSchemaProcessColumns(BaseTests):
+
+    @property
+    def klass(self):
+        return CrewSchema
+
+    def test_process_columns_matches_process(self):
+        np = pytest.importorskip('numpy')
+
+        records = [
+            {'name': 'worf', 'age_int': 30},
+            {'name': 'odo', 'age_int': 'x'},
+            {'age_int': '40', 'species': None},
+        ]
+        schema = self.klass()
+        data, errors, mask = schema.process_columns(records)
+
+        assert data['age'].dtype == np.int64
+        assert data['age'][0] == 30 and data['age'][2] == 40
+        assert mask['age'].tolist() == [False, True, False]
+        assert list(data['name'][:2]) == ['worf', 'odo']
+        assert errors == {
+            i: res.errors
+            for i, res in enumerate(schema.process_many(records))
+            if res.errors
+        }
+
+    def test_to_structured_array(self):
+        np = pytest.importorskip('numpy')
+
+        columns = {'name': ['sisko', 'kira'], 'age_int': np.array([45, 30])}
+        array, errors, mask = self.klass().to_structured_array(columns)
+
+        assert array['age'].tolist() == [45, 30]
+        assert array['rank'].tolist() == ['ensign', 'ensign']
+        assert errors == {}
+
+
+@mark.unit
+class TestSchemaExecutor(BaseTests):
+
+    @property
+    def klass(self):
+        return SchemaExecutor
+
+    def test_results_are_in_order(self):
+        records = [{'name': str(i), 'age_int': i} for i in range(50)]
+        records[7]['age_int'] = 'x'
+        schema = CrewSchema()
+
+        with self.klass(schema, workers=2, chunk_size=8) as executor:
+            results = executor.process_many(records)
+
+        assert results == schema.process_many(records)
+
+    def test_only(self):
+        records = [{'age_int': i} for i in range(5)]
+        with self.klass(CrewSchema(), workers=1) as executor:
+            results = executor.process_many(records, only={'age'})
+        assert [res.data for res in results] == [{'age': i} for i in range(5)]
+        assert all(not res.errors for res in results)
+
+    def test_strict(self):
+        with self.klass(CrewSchema(), workers=1) as executor:
+            assert executor.process_many([{'name': 'nog'}], strict=True)[0]['name'] == 'nog'
+            with pytest.raises(ValidationError):
+                executor.process_many([{}], strict=True)
+
+
+@mark.unit
+class TestSchemaGenerate(BaseTests):
+
+    @property
+    def klass(self):
+        return CrewSchema
+
+    def test_generate_many(self):
+        records = self.klass().generate_many(5)
+        assert len(records) == 5
+        for record in records:
+            assert set(record) == set(self.klass.fields)
+            assert isinstance(record['age'], int)
+
+    def test_generator_cache_is_invalidated(self):
+        field = fields.String(name='rank')
+        generator = fields.Field.Generator()
+        generator.register('rank', lambda f, **kwargs: 'captain')
+        assert generator.generate(field) == 'captain'
+        generator.register('rank', lambda f, **kwargs: 'commander')
+        assert generator.generate(field) == 'commander'
+        generator.unregister('rank')
+        assert isinstance(generator.generate(field), str)
+
+    def test_generate_many_is_reproducible(self):
+        schema = self.klass()
+        records = schema.generate_many(6, seed=1701)
+        assert records == schema.generate_many(6, seed=1701)
+        assert records[2:4] == schema.generate_range(2, 4, seed=1701)
+        assert records == schema.generate_many(6, seed=1701, workers=2, chunk_size=4)
+        assert records != schema.generate_many(6, seed=1702)
+
+    def test_generated_dates_do_not_depend_on_the_clock(self, monkeypatch):
+        from faker.providers import date_time
+
+        class ShipLogSchema(Schema):
+            stardate = fields.DateTime()
+            entry = fields.DateTimeString()
+            timestamp = fields.Timestamp()
+            year = fields.Int()
+            month = fields.String()
+
+        schema = ShipLogSchema()
+        records = schema.generate_many(4, seed=1701)
+
+        class Later(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime.now(tz) + timedelta(days=100)
+
+        monkeypatch.setattr(date_time, 'datetime', Later)
+        assert schema.generate_many(4, seed=1701) == records
+
+    def test_unseeded_workers_generate_current_dates(self):
+        class ShipLogSchema(Schema):
+            stardate = fields.DateTime()
+
+        year = datetime.now().year
+        records = ShipLogSchema().generate_many(6, workers=2, chunk_size=2)
+        assert len(records) == 6
+        assert {record['stardate'].year for record in records} == {year}
+
+
+@mark.unit
+class TestSchemaRecord(BaseTests):
+
+    @property
+    def klass(self):
+        return SchemaRecord
+
+    def test_validate_only_processes_dirty_fields(self):
+        calls = []
+
+        def after(field, value, data, context=None):
+            calls.append(field.name)
+            return (value, None)
+
+        class ShipSchema(Schema):
+            name = fields.String(required=True, after=after)
+            crew = fields.Int(source='crew_int', after=after)
+
+        record = self.klass(ShipSchema(), {'name': 'defiant', 'crew_int': 'x'})
+        assert record.validate() == ({'name': 'defiant'}, {'crew': 'crew not nullable'})
+        assert sorted(calls) == ['crew', 'name']
+
+        calls.clear()
+        record['crew_int'] = '50'
+        assert record.dirty == {'crew'}
+        assert record.validate() == ({'name': 'defiant', 'crew': 50}, {})
+        assert calls == ['crew']
+
+        calls.clear()
+        assert record.validate() == ({'name': 'defiant', 'crew': 50}, {})
+        assert calls == []
+
+        del record['name']
+        assert record.validate() == ({'crew': 50}, {'name': 'name is required'})
+        with pytest.raises(ValidationError):
+            record.validate(strict=True)
+
+    def test_matches_process(self):
+        schema = CrewSchema()
+        record = self.klass(schema, {'name': 'worf'})
+        record.validate()
+        record.update(age_int='30', species=None)
+        record.pop('name')
+        assert record.validate() == schema.process(record.source)
+
+
+@mark.unit
+class TestSchemaDumpJson(BaseTests):
+
+    @property
+    def klass(self):
+        class LogSchema(Schema):
+            id = fields.Uuid()
+            stardate = fields.DateTime()
+            tags = fields.Set(fields.String())
+            officer = fields.Nested(CrewSchema)
+            entries = fields.List(fields.Nested({'at': fields.DateTime()}))
+
+        return LogSchema
+
+    def test_dump_json_matches_json_encoder(self):
+        import io
+        from appyratus.json import JsonEncoder
+
+        schema = self.klass()
+        records = [schema.generate() for _ in range(5)] + [{'id': None}]
+        for record in records:
+            record['tags'] = set(record.get('tags') or ())
+
+        json = JsonEncoder()
+        expected = json.encode(records)
+        assert schema.dump_json(records[0]) == json.encode(records[0])
+        assert schema.dump_json(records) == expected
+        assert schema.dump_json(iter(records)) == expected
+
+        text_stream, bytes_stream = io.StringIO(), io.BytesIO()
+        schema.dump_json(iter(records), stream=text_stream)
+        schema.dump_json(records, stream=bytes_stream)
+        assert text_stream.getvalue() == expected
+        assert bytes_stream.getvalue().decode() == expected
+
+    def test_records_are_not_modified(self):
+        record = {'tags': {'a'}}
+        assert self.klass().dump_json(record) == '{"tags":["a"]}'
+        assert record == {'tags': {'a'}}
+
+
+@mark.unit
+class TestSchemaJsonSchema(BaseTests):
+
+    @property
+    def klass(self):
+        class ShipSchema(Schema):
+            id = fields.Uuid(required=True)
+            name = fields.String(required=True)
+            registry = fields.Enum(fields.String(), ['NCC-1701', 'NX-74205'])
+            crew = fields.Int(source='crew_count')
+            warp = fields.Float(nullable=True)
+            active = fields.Bool(default=True)
+            captain = fields.Nested(CrewSchema)
+            contacts = fields.List(fields.Email())
+
+        return ShipSchema
+
+    def test_to_json_schema(self):
+        json_schema = self.klass().to_json_schema()
+        assert json_schema['type'] == 'object'
+        assert json_schema['required'] == ['id', 'name']
+        assert set(json_schema['properties']) == {
+            'id', 'name', 'registry', 'crew_count', 'warp', 'active',
+            'captain', 'contacts',
+        }
+        assert json_schema['properties']['registry']['enum'] == ['NCC-1701', 'NX-74205']
+        assert json_schema['properties']['captain']['required'] == ['name']
+        assert json_schema['properties']['warp']['anyOf'][-1] == {'type': 'null'}
+
+    @mark.params(
+        'source, is_valid',
+        [
+            ({'id': 'a' * 32, 'name': 'enterprise'}, True),
+            ({'id': 1, 'name': 'defiant', 'crew_count': '50', 'warp': None}, True),
+            ({'id': 'A-' * 32, 'name': 1, 'active': 'FALSE', 'warp': '9.5'}, True),
+            ({'id': 'a' * 32, 'name': 'x', 'captain': {'name': 'sisko'}}, True),
+            ({'id': 'a' * 32, 'name': 'x', 'contacts': ['kira@ds9.org']}, True),
+            ({'id': 'a' * 32, 'name': 'x', 'contacts': ['kíra@bajor.bj']}, True),
+            ({'id': 'a' * 32, 'name': 'x', 'registry': 'NX-74205'}, True),
+            ({'id': 'a' * 31, 'name': 'voyager'}, False),
+            ({'name': 'voyager'}, False),
+            ({'id': 'a' * 32, 'name': None}, False),
+            ({'id': 'a' * 32, 'name': 'x', 'crew_count': '-1'}, False),
+            ({'id': 'a' * 32, 'name': 'x', 'active': 'maybe'}, False),
+            ({'id': 'a' * 32, 'name': 'x', 'warp': 'fast'}, False),
+            ({'id': 'a' * 32, 'name': 'x', 'captain': {}}, False),
+            ({'id': 'a' * 32, 'name': 'x', 'contacts': ['kira']}, False),
+            ({'id': 'a' * 32, 'name': 'x', 'contacts': ['kira@ds9.org\n']}, False),
+            ({'id': 'a' * 32, 'name': 'x', 'registry': 'NCC-1864'}, False),
+        ]
+    )
+    def test_validate_json_bytes_agrees_with_process(self, source, is_valid):
+        import rapidjson
+
+        schema = self.klass()
+        raw = rapidjson.dumps(source).encode()
+        errors = schema.validate_json_bytes(raw)
+        assert (not errors) == is_valid
+        assert (not schema.process(source).errors) == is_valid
+        assert bool(schema.process_json(raw).errors) == bool(errors)
+
+    def test_process_json_invalid_json(self):
+        schema = self.klass()
+        assert schema.validate_json_bytes(b'{"id": ') == {'#': 'invalid JSON'}
+        with pytest.raises(ValidationError):
+            schema.process_json(b'[]', strict=True)
+
+
+@mark.unit
+class TestSchemaResultCache(BaseTests):
+
+    @property
+    def klass(self):
+        return ResultCache
+
+    def test_identical_records_hit_the_cache(self):
+        class ProbeSchema(Schema):
+            name = fields.String(required=True)
+            tags = fields.List(fields.String(), default=list)
+
+        schema = ProbeSchema(cache=self.klass(max_size=2))
+        first = schema.process({'name': 'probe', 'tags': ['a']})
+        first.data['tags'].append('mutated')
+        again = schema.process({'tags': ['a'], 'name': 'probe'})
+        assert again == ({'name': 'probe', 'tags': ['a']}, {})
+        assert schema.process({}) == ({'tags': []}, {'name': 'name is required'})
+        assert schema.process({}, ignore_required=True).errors == {}
+        assert schema.cache.stats['hits'] == 1
+        assert schema.cache.stats['misses'] == 3
+        assert schema.cache.stats['evictions'] == 1
+        with pytest.raises(ValidationError):
+            schema.process({}, strict=True)
+
+    def test_shared_cache(self):
+        class RankSchema(Schema):
+            rank = fields.String()
+
+        class LevelSchema(Schema):
+            rank = fields.Int()
+
+        cache = self.klass()
+        record = {'rank': '3'}
+        assert RankSchema(cache=cache).process(record).data == {'rank': '3'}
+        assert LevelSchema(cache=cache).process(record).data == {'rank': 3}
+        assert cache.stats['misses'] == 2
+
+    def test_hits_are_cheaper_than_processing(self):
+        import time
+
+        class ProbeSchema(Schema):
+            name = fields.String(required=True)
+            email = fields.Email()
+            ids = fields.List(fields.Int())
+            ship = fields.Nested({'name': fields.String(), 'crew': fields.Int()})
+
+        record = {
+            'name': 'probe',
+            'email': 'probe@ds9.org',
+            'ids': [str(i) for i in range(50)],
+            'ship': {'name': 'defiant', 'crew': '50'},
+        }
+
+        def timed(schema):
+            started = time.perf_counter()
+            for _ in range(2000):
+                schema.process(record)
+            return time.perf_counter() - started
+
+        uncached = min(timed(ProbeSchema()) for _ in range(3))
+        schema = ProbeSchema(cache=True)
+        hits = min(timed(schema) for _ in range(3))
+        assert schema.cache.stats['misses'] == 1
+        assert hits < uncached * 0.8
+
+    def test_unhashable_callable_default(self):
+        class Roster(object):
+            def __eq__(self, other):
+                return isinstance(other, Roster)
+
+            def __call__(self):
+                return [1]
+
+        field = fields.List(fields.Int(), default=Roster())
+        assert not field.is_cacheable()
+        schema = Schema.factory('ProbeSchema', {'ids': field})(cache=True)
+        assert schema.process({}).data == {'ids': [1]}
+
+    def test_make_key_needs_exact_json_types(self):
+        class Rank(IntEnum):
+            ENSIGN = 1
+
+        make_key = self.klass.make_key
+        assert make_key({'tags': ['a'], 'rank': 1}) is not None
+        assert make_key({'tags': ['a']}) == make_key({'tags': ['a']})
+        assert make_key({'tags': ('a', )}) is None
+        assert make_key({'rank': Rank.ENSIGN}) is None
+        assert make_key({'nested': OrderedDict(rank=1)}) is None
+        assert make_key({'uuid': uuid4()}) is None
+
+    def test_ttl(self):
+        cache = self.klass(ttl=0)
+        cache.set(('key', ), ({}, {}))
+        assert cache.get(('key', )) is None
+
+    @mark.params(
+        'field, is_cacheable',
+        [
+            (fields.String(), True),
+            (fields.List(fields.Int(), default=list), True),
+            (fields.DateTime(default=True), False),
+            (fields.BcryptString(rounds=4), False),
+            (fields.String(before=lambda f, v, context=None: (v, None)), False),
+            (fields.Nested({'password': fields.BcryptString(rounds=4)}), False),
+        ]
+    )
+    def test_uncacheable_fields(self, field, is_cacheable):
+        schema_type = Schema.factory('ProbeSchema', {'value': field})
+        schema = schema_type(cache=True)
+        assert schema.is_cacheable() == is_cacheable
+        schema.process({'value': 'x'})
+        schema.process({'value': 'x'})
+        assert schema.cache.hits == (1 if is_cacheable else 0)
+
+
+@mark.unit
+class TestSchemaMetrics(BaseTests):
+
+    def test_instrument(self):
+        class MetricsSchema(Schema):
+            name = fields.String(after=lambda f, v, d, context=None: (v, None))
+            age = fields.Int()
+            ship = fields.Nested({'registry': fields.Int()})
+
+        metrics = MetricsSchema.instrument()
+        assert isinstance(metrics, SchemaMetrics)
+        assert MetricsSchema.get_processor().metrics is metrics
+
+        schema = MetricsSchema()
+        schema.process({'name': 'odo', 'age': 'x', 'ship': {'registry': 'y'}})
+        schema.process({'name': 'odo', 'age': 1})
+
+        stats = metrics.to_dict()['MetricsSchema']
+        assert stats['age']['process']['calls'] == 2
+        assert stats['age']['process']['errors'] == {'invalid': 1}
+        assert stats['name']['after']['calls'] == 2
+        assert 'before' not in stats['name']
+        assert stats['ship']['process']['errors'] == {'nested': 1}
+        ship_type = MetricsSchema.fields['ship'].schema_type
+        assert metrics.to_dict()[ship_type.__name__]['registry']['process']['calls'] == 1
+
+        text = metrics.to_prometheus()
+        assert (
+            'appyratus_schema_field_calls_total'
+            '{schema="MetricsSchema",field="age",stage="process"} 2'
+        ) in text
+        assert (
+            'appyratus_schema_field_errors_total'
+            '{schema="MetricsSchema",field="age",stage="process",error="invalid"} 1'
+        ) in text
+
+        MetricsSchema.uninstrument()
+        schema.process({'age': 1})
+        assert metrics.to_dict()['MetricsSchema']['age']['process']['calls'] == 2
+
+        metrics.reset()
+        assert metrics.to_dict()['MetricsSchema']['age']['process']['calls'] == 0
+
+    def test_same_named_schemas_are_kept_apart(self):
+        first = Schema.factory('Crew', {'age': fields.Int()})
+        second = Schema.factory('Crew', {'age': fields.Int()})
+        metrics = first.instrument()
+        second.instrument(metrics)
+
+        first().process({'age': 1})
+        second().process({'age': 'x'})
+        second().process({'age': 2})
+
+        stats = metrics.to_dict()
+        assert metrics.get_name(first) == 'Crew'
+        assert metrics.get_name(second) == 'Crew#2'
+        assert stats['Crew']['age']['process']['calls'] == 1
+        assert stats['Crew']['age']['process']['errors'] == {}
+        assert stats['Crew#2']['age']['process']['calls'] == 2
+        assert stats['Crew#2']['age']['process']['errors'] == {'invalid': 1}
+        assert 'schema="Crew#2",field="age"' in metrics.to_prometheus()
+
+
+@mark.unit
+class TestSchemaAsyncProcess(BaseTests):
+
+    def test_aprocess(self):
+        active = []
+        peak = []
+
+        async def lookup(field, value, context=None):
+            active.append(value)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.remove(value)
+            return (value.upper(), None)
+
+        async def after(field, value, data, context=None):
+            return (f'{value} of {data["ship"]["name"]}', None)
+
+        class ShipSchema(Schema):
+            name = fields.String(before=lookup)
+
+        class CrewmanSchema(Schema):
+            name = fields.String(before=lookup, after=after)
+            rank = fields.String(before=lookup)
+            age = fields.Int()
+            ship = fields.Nested(ShipSchema)
+            shuttles = fields.List(fields.Nested(ShipSchema))
+
+        source = {
+            'name': 'nog',
+            'rank': 'cadet',
+            'age': 'x',
+            'ship': {'name': 'defiant'},
+            'shuttles': [{'name': 'rubicon'}, {'name': 'orinoco'}],
+        }
+        res = asyncio.run(CrewmanSchema().aprocess(source))
+        assert res.data == {
+            'name': 'NOG of DEFIANT',
+            'rank': 'CADET',
+            'ship': {'name': 'DEFIANT'},
+            'shuttles': [{'name': 'RUBICON'}, {'name': 'ORINOCO'}],
+        }
+        assert list(res.data) == ['name', 'rank', 'ship', 'shuttles']
+        assert res.errors == {'age': 'age not nullable'}
+        # hooks of top-level fields, then those of nested schemas, overlap
+        assert max(peak) == 3
+
+        with pytest.raises(ValidationError):
+            asyncio.run(CrewmanSchema().aprocess(source, strict=True))
+
+    def test_aprocess_max_errors(self):
+        looked_up = []
+
+        async def lookup(field, value, context=None):
+            looked_up.append(field.name)
+            return (value, None)
+
+        async def arank(field, value, context=None):
+            return (value, 'unknown rank')
+
+        def count(field, value, context=None):
+            looked_up.append('ship')
+            return (value, None)
+
+        class ShipSchema(Schema):
+            name = fields.Int(nullable=True, before=count)
+
+        class CrewmanSchema(Schema):
+            rank = fields.String(before=arank)
+            name = fields.String(before=lookup)
+            shuttles = fields.List(fields.Nested(ShipSchema), nullable=True)
+
+        source = {
+            'rank': 'cadet',
+            'name': 'nog',
+            'shuttles': [{'name': 'x'}, {'name': 1}, {'name': 'y'}, {'name': 'z'}],
+        }
+        schema = CrewmanSchema()
+        res = asyncio.run(schema.aprocess(source, fail_fast=True))
+        assert res.errors == {'rank': 'unknown rank'}
+        assert looked_up == []
+
+        res = asyncio.run(schema.aprocess(source, max_errors=3))
+        assert res.errors['shuttles'] == {0: {'name': 'invalid'}, 2: {'name': 'invalid'}}
+        assert looked_up == ['name', 'ship', 'ship', 'ship']
+
+        looked_up.clear()
+        shuttles = CrewmanSchema.fields['shuttles']
+        dest, errors = asyncio.run(shuttles.aprocess(source['shuttles'], max_errors=1))
+        assert errors == {0: {'name': 'invalid'}}
+        assert looked_up == ['ship']
+
+    def test_overridden_process_in_list(self):
+        class Lookup(fields.String):
+            async def aprocess(self, value, **kwargs):
+                return (value.upper(), None)
+
+        class Badge(Lookup):
+            def process(self, value):
+                return (f'{value} badge', None)
+
+        class CrewmanSchema(Schema):
+            badge = Badge()
+            badges = fields.List(Badge())
+
+        source = {'badge': 'nog', 'badges': ['nog', 'jake']}
+        expected = CrewmanSchema().process(source)
+        assert expected.data == {'badge': 'nog badge', 'badges': ['nog badge', 'jake badge']}
+        assert asyncio.run(CrewmanSchema().aprocess(source)) == expected
+
+    def test_aprocess_matches_process(self):
+        schema = CrewSchema()
+        for source in [{'name': 'worf', 'age_int': '30'}, {}, {'name': None}]:
+            assert asyncio.run(schema.aprocess(source)) == schema.process(source)
@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from appyratus.test import mark, BaseTests
+from appyratus.json import JsonEncoder
+from appyratus.utils.dict_utils import DictObject
+
+
+class Stardate(datetime):
+    pass
+
+
+class ShipLog(DictObject):
+    pass
+
+
+@mark.unit
+class TestJsonEncoder(BaseTests):
+
+    @property
+    def klass(self):
+        return JsonEncoder
+
+    def test_get_instance(self):
+        assert self.klass.get_instance() is self.klass.get_instance()
+
+        class StardateEncoder(self.klass):
+            pass
+
+        instance = StardateEncoder.get_instance()
+        assert isinstance(instance, StardateEncoder)
+        assert instance is StardateEncoder.get_instance()
+        assert self.klass.get_instance() is not instance
+        assert type(self.klass.get_instance()) is self.klass
+
+    def test_subclasses(self):
+        json = self.klass()
+        stardate = Stardate(2370, 1, 1, tzinfo=timezone.utc)
+        assert json.encode(stardate) == json.encode(
+            datetime(2370, 1, 1, tzinfo=timezone.utc)
+        )
+        assert json.encode(ShipLog({'captain': 'sisko'})) == '{"captain":"sisko"}'
+        assert json.get_handler(Stardate) is json.defaults[datetime]
+
+    def test_register(self):
+        json = self.klass()
+        assert json.encode(Decimal('1.5')) == '"1.5"'
+        json.register(Decimal, float)
+        assert json.encode(Decimal('1.5')) == '1.5'
+        json.unregister(Decimal)
+        assert json.encode(Decimal('1.5')) == '"1.5"'
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from dateutil.parser import parse
+
+from appyratus.test import (
+    BaseTests,
+    mark,
+)
+from appyratus.utils.time_utils import TimeUtils
+
+
+@mark.unit
+class TestTimeUtils(BaseTests):
+
+    @classmethod
+    def __klass__(cls):
+        return TimeUtils
+
+    @mark.params(
+        'text, expected',
+        [
+    # ISO-8601 strings take the fast path
+            ('2161-01-01', datetime(2161, 1, 1)),
+            ('2161-01-01T11:33:37', datetime(2161, 1, 1, 11, 33, 37)),
+            ('2161-01-01 11:33:37.123', datetime(2161, 1, 1, 11, 33, 37, 123000)),
+            (
+                '2161-01-01T11:33:37Z',
+                datetime(2161, 1, 1, 11, 33, 37, tzinfo=timezone.utc)
+            ),
+            (
+                '2161-01-01T11:33:37+05:30',
+                datetime(
+                    2161, 1, 1, 11, 33, 37,
+                    tzinfo=timezone(timedelta(hours=5, minutes=30))
+                )
+            ),
+    # Anything else falls back to dateutil
+            ('Jan 1 2161 11:33:37', datetime(2161, 1, 1, 11, 33, 37)),
+        ]
+    )
+    def test_parse_datetime_string(self, text, expected):
+        assert self.get_klass().parse_datetime_string(text) == expected
+        assert self.get_klass().parse_datetime_string(text, cache=True) == expected
+
+    @mark.params(
+        'text', [
+            '2161-01-01T11:33:37Z',
+            '2161-01-01T11:33:37+00:00',
+            '2161-01-01T11:33:37-00:00',
+            '2161-01-01T11:33:37-08:00',
+            '2161-01-01 11:33:37.123+05:30',
+        ]
+    )
+    def test_parse_datetime_string_time_zone(self, text):
+        expected = parse(text)
+        for cache in (False, True):
+            dt = self.get_klass().parse_datetime_string(text, cache=cache)
+            assert dt == expected
+            assert type(dt.tzinfo) is type(expected.tzinfo)
+            assert dt.tzname() == expected.tzname()
+            assert dt.strftime('%Z') == expected.strftime('%Z')
+
+    @mark.params('text', ['2161-13-01', 'klingon', '6027478417'])
+    def test_parse_datetime_string_invalid(self, text):
+        with pytest.raises((ValueError, OverflowError)):
+            self.get_klass().parse_datetime_string(text)